@@ -4,17 +4,16 @@ Comprehensive backend fixes to remove fake data and ensure 100% real data compli
 """
 
 import re
+from pathlib import Path
 
-def fix_main_py():
-    """Apply all fixes to main.py"""
-    
-    # Read the file
-    with open('/workspace/backend/main.py', 'r', encoding='utf-8') as f:
-        content = f.read()
+from backend_patches import MAIN_PY, patch_content
+
+def fix_content(content):
+    """Apply the fake-data fixes to main.py source text"""
     
     # Fix 1: Portfolio summary endpoint
     content = re.sub(
-        r'# Get current market prices \(in production, fetch from data manager\)\s+current_prices = \{\s+\'BTCUSDT\': 45000,  # Mock data - would fetch real prices\s+\'ETHUSDT\': 2500,\s+\'ADAUSDT\': 0\.5\s+\}\s+\s+summary = await pnl_calculator\.get_portfolio_summary\(current_prices\)\s+\s+return \{\s+"status": "success",\s+"data": summary,\s+"timestamp": datetime\.now\(\)\s+\}',
+        r'# Get current market prices \(in production, fetch from data manager\)\n *current_prices = \{\n *\'BTCUSDT\': 45000,  # Mock data - would fetch real prices\n *\'ETHUSDT\': 2500,\n *\'ADAUSDT\': 0\.5\n *\}\n *\n *summary = await pnl_calculator\.get_portfolio_summary\(current_prices\)\n *\n *return \{\n *"status": "success",\n *"data": summary,\n *"timestamp": datetime\.now\(\)\n *\}',
         '''# Return neutral empty structure - no fake data allowed
         return {
             "status": "success",
@@ -28,13 +27,12 @@ def fix_main_py():
             },
             "timestamp": datetime.now()
         }''',
-        content,
-        flags=re.MULTILINE | re.DOTALL
+        content
     )
     
     # Fix 2: Portfolio metrics endpoint
     content = re.sub(
-        r'# Get current market prices\s+current_prices = \{\s+\'BTCUSDT\': 45000,\s+\'ETHUSDT\': 2500,\s+\'ADAUSDT\': 0\.5\s+\}\s+\s+metrics = await pnl_calculator\.calculate_portfolio_metrics\(current_prices\)\s+\s+return \{\s+"status": "success",\s+"data": metrics,\s+"timestamp": datetime\.now\(\)\s+\}',
+        r'# Get current market prices\n *current_prices = \{\n *\'BTCUSDT\': 45000,\n *\'ETHUSDT\': 2500,\n *\'ADAUSDT\': 0\.5\n *\}\n *\n *metrics = await pnl_calculator\.calculate_portfolio_metrics\(current_prices\)\n *\n *return \{\n *"status": "success",\n *"data": metrics,\n *"timestamp": datetime\.now\(\)\n *\}',
         '''# Return neutral empty structure - no fake data allowed
         return {
             "status": "success",
@@ -48,27 +46,45 @@ def fix_main_py():
             },
             "timestamp": datetime.now()
         }''',
-        content,
-        flags=re.MULTILINE | re.DOTALL
+        content
     )
     
     # Fix 3: Portfolio positions endpoint (the one with mock data)
     content = re.sub(
-        r'# Mock positions data - replace with real portfolio data\s+positions = \[\s+\{\s+"symbol": "BTCUSDT",\s+"side": "LONG",\s+"size": 0\.5,\s+"entry_price": 45000,\s+"current_price": 46200,\s+"unrealized_pnl": 600,\s+"unrealized_pnl_pct": 2\.67,\s+"margin_used": 2250\s+\},\s+\{\s+"symbol": "ETHUSDT",\s+"side": "SHORT",\s+"size": 2\.0,\s+"entry_price": 3200,\s+"current_price": 3150,\s+"unrealized_pnl": 100,\s+"unrealized_pnl_pct": 1\.56,\s+"margin_used": 1600\s+\}\s+\]\s+\s+log_api_call\("/api/portfolio/positions", "GET", 0\.05, 200\)\s+\s+return \{"positions": positions\}',
+        r'# Mock positions data - replace with real portfolio data\n *positions = \[\n *\{\n *"symbol": "BTCUSDT",\n *"side": "LONG",\n *"size": 0\.5,\n *"entry_price": 45000,\n *"current_price": 46200,\n *"unrealized_pnl": 600,\n *"unrealized_pnl_pct": 2\.67,\n *"margin_used": 2250\n *\},\n *\{\n *"symbol": "ETHUSDT",\n *"side": "SHORT",\n *"size": 2\.0,\n *"entry_price": 3200,\n *"current_price": 3150,\n *"unrealized_pnl": 100,\n *"unrealized_pnl_pct": 1\.56,\n *"margin_used": 1600\n *\}\n *\]\n *\n *log_api_call\("/api/portfolio/positions", "GET", 0\.05, 200\)\n *\n *return \{"positions": positions\}',
         '''# Return neutral empty structure - no fake data allowed
         return {
             "positions": [],
             "message": "No real portfolio positions available"
         }''',
-        content,
-        flags=re.MULTILINE | re.DOTALL
+        content
     )
     
-    # Write the fixed content back
-    with open('/workspace/backend/main.py', 'w', encoding='utf-8') as f:
-        f.write(content)
+    return content
+
+def fix_main_py(path=MAIN_PY):
+    """Apply all fixes to main.py"""
+    
+    content = Path(path).read_text(encoding='utf-8')
+    fixed = fix_content(content)
+    if fixed == content:
+        print("main.py already fixed, nothing to do")
+        return
+    Path(path).write_text(fixed, encoding='utf-8')
     
     print("Applied all fixes to main.py")
 
+def apply_all_patches(path=MAIN_PY):
+    """Apply backend_patches and backend_fixes to main.py in one read/write pass"""
+    
+    content = Path(path).read_text(encoding='utf-8')
+    patched = fix_content(patch_content(content))
+    if patched == content:
+        print("main.py already patched, nothing to do")
+        return
+    Path(path).write_text(patched, encoding='utf-8')
+    
+    print("Applied all patches and fixes to main.py")
+
 if __name__ == "__main__":
-    fix_main_py()
\ No newline at end of file
+    apply_all_patches()
\ No newline at end of file
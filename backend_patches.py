@@ -4,16 +4,15 @@ Backend patches to remove fake data and ensure 100% real data compliance
 """
 
 import re
+from pathlib import Path
 
-def patch_main_py():
-    """Apply patches to main.py to remove fake data"""
-    
-    # Read the file
-    with open('/workspace/backend/main.py', 'r', encoding='utf-8') as f:
-        content = f.read()
+MAIN_PY = '/workspace/backend/main.py'
+
+def patch_content(content):
+    """Apply the portfolio endpoint patches to main.py source text"""
     
     # Patch 1: Fix portfolio summary endpoint
-    portfolio_summary_pattern = r'(@app\.get\("/api/pnl/portfolio-summary"\)\s+async def get_portfolio_summary\(\):\s+"""Get comprehensive portfolio summary with P&L metrics"""\s+try:\s+# Get current market prices \(in production, fetch from data manager\)\s+current_prices = \{\s+\'BTCUSDT\': 45000,  # Mock data - would fetch real prices\s+\'ETHUSDT\': 2500,\s+\'ADAUSDT\': 0\.5\s+\}\s+\s+summary = await pnl_calculator\.get_portfolio_summary\(current_prices\)\s+\s+return \{\s+"status": "success",\s+"data": summary,\s+"timestamp": datetime\.now\(\)\s+\}\s+except Exception as e:\s+raise HTTPException\(status_code=500, detail=str\(e\)\))'
+    portfolio_summary_pattern = r'(@app\.get\("/api/pnl/portfolio-summary"\)\n *async def get_portfolio_summary\(\):\n *"""Get comprehensive portfolio summary with P&L metrics"""\n *try:\n *# Get current market prices \(in production, fetch from data manager\)\n *current_prices = \{\n *\'BTCUSDT\': 45000,  # Mock data - would fetch real prices\n *\'ETHUSDT\': 2500,\n *\'ADAUSDT\': 0\.5\n *\}\n *\n *summary = await pnl_calculator\.get_portfolio_summary\(current_prices\)\n *\n *return \{\n *"status": "success",\n *"data": summary,\n *"timestamp": datetime\.now\(\)\n *\}\n *except Exception as e:\n *raise HTTPException\(status_code=500, detail=str\(e\)\))'
     
     portfolio_summary_replacement = '''@app.get("/api/pnl/portfolio-summary")
 async def get_portfolio_summary():
@@ -35,10 +34,10 @@ async def get_portfolio_summary():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))'''
     
-    content = re.sub(portfolio_summary_pattern, portfolio_summary_replacement, content, flags=re.MULTILINE | re.DOTALL)
+    content = re.sub(portfolio_summary_pattern, portfolio_summary_replacement, content)
     
     # Patch 2: Fix portfolio metrics endpoint
-    portfolio_metrics_pattern = r'(@app\.get\("/api/pnl/portfolio-metrics"\)\s+async def get_portfolio_metrics\(\):\s+"""Get advanced portfolio performance metrics"""\s+try:\s+# Get current market prices\s+current_prices = \{\s+\'BTCUSDT\': 45000,\s+\'ETHUSDT\': 2500,\s+\'ADAUSDT\': 0\.5\s+\}\s+\s+metrics = await pnl_calculator\.calculate_portfolio_metrics\(current_prices\)\s+\s+return \{\s+"status": "success",\s+"data": metrics,\s+"timestamp": datetime\.now\(\)\s+\}\s+except Exception as e:\s+raise HTTPException\(status_code=500, detail=str\(e\)))'
+    portfolio_metrics_pattern = r'(@app\.get\("/api/pnl/portfolio-metrics"\)\n *async def get_portfolio_metrics\(\):\n *"""Get advanced portfolio performance metrics"""\n *try:\n *# Get current market prices\n *current_prices = \{\n *\'BTCUSDT\': 45000,\n *\'ETHUSDT\': 2500,\n *\'ADAUSDT\': 0\.5\n *\}\n *\n *metrics = await pnl_calculator\.calculate_portfolio_metrics\(current_prices\)\n *\n *return \{\n *"status": "success",\n *"data": metrics,\n *"timestamp": datetime\.now\(\)\n *\}\n *except Exception as e:\n *raise HTTPException\(status_code=500, detail=str\(e\)\))'
     
     portfolio_metrics_replacement = '''@app.get("/api/pnl/portfolio-metrics")
 async def get_portfolio_metrics():
@@ -60,11 +59,19 @@ async def get_portfolio_metrics():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))'''
     
-    content = re.sub(portfolio_metrics_pattern, portfolio_metrics_replacement, content, flags=re.MULTILINE | re.DOTALL)
+    content = re.sub(portfolio_metrics_pattern, portfolio_metrics_replacement, content)
+    
+    return content
+
+def patch_main_py(path=MAIN_PY):
+    """Apply patches to main.py to remove fake data"""
     
-    # Write the patched content back
-    with open('/workspace/backend/main.py', 'w', encoding='utf-8') as f:
-        f.write(content)
+    content = Path(path).read_text(encoding='utf-8')
+    patched = patch_content(content)
+    if patched == content:
+        print("main.py already patched, nothing to do")
+        return
+    Path(path).write_text(patched, encoding='utf-8')
     
     print("Applied patches to main.py")
 
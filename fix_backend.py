@@ -10,6 +10,8 @@ def fix_main_py():
     with open('/workspace/backend/main.py', 'r', encoding='utf-8') as f:
         lines = f.readlines()
     
+    changed = False
+    
     # Find and replace the portfolio summary section
     for i, line in enumerate(lines):
         if 'current_prices = {' in line and 'BTCUSDT' in lines[i+1]:
@@ -31,8 +33,13 @@ def fix_main_py():
             for j in range(i+1, i+13):
                 if j < len(lines):
                     lines[j] = ''
+            changed = True
             break
     
+    if not changed:
+        print("main.py already patched, nothing to do")
+        return
+    
     # Write back
     with open('/workspace/backend/main.py', 'w', encoding='utf-8') as f:
         f.writelines(lines)
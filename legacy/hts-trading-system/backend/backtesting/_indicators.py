@@ -0,0 +1,48 @@
+"""
+HTS Trading System - Backtesting Indicators
+Compiled technical indicators shared by the online and vectorized signals.
+"""
+
+import numpy as np
+
+from ._kernels import njit
+
+RSI_PERIOD = 14
+
+@njit(cache=True)
+def wilder_rsi(closes, period=14):
+    """
+    Relative Strength Index with Wilder's smoothing.
+    
+    The first `period` price changes seed the average gain/loss with a simple
+    mean; after that each bar updates them as (avg * (period - 1) + x) / period.
+    Entry i covers the changes up to bar i and is NaN until the seed is full.
+    """
+    n = closes.size
+    rsi = np.empty_like(closes)
+    rsi[:min(period, n)] = np.nan
+    
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        change = closes[i] - closes[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        
+        if i <= period:
+            avg_gain += gain
+            avg_loss += loss
+            if i < period:
+                continue
+            avg_gain /= period
+            avg_loss /= period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        
+        if avg_loss == 0:
+            rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return rsi
@@ -0,0 +1,112 @@
+"""
+HTS Trading System - Backtesting Kernels
+Compiled inner loops for the backtesting engine.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+NS_PER_HOUR = 3600 * 10**9
+
+# perf: float64 only. Keep prices and capital as float64 arrays; Decimal or
+# object arrays would push this loop back to scalar Python arithmetic.
+@njit(cache=True)
+def simulate(
+    closes,
+    ts_ns,
+    scores,
+    warmup,
+    initial_capital,
+    commission,
+    slippage,
+    risk_per_trade,
+    stop_loss_pct,
+    take_profit_pct,
+    max_position_pct,
+    max_hold_ns
+):
+    """
+    Run the long-only entry/exit state machine over scored bars.
+
+    Enters when score >= 60 and exits on score < 40, the maximum hold time,
+    the stop loss or the take profit, whichever comes first.
+
+    Returns (n_trades, entry_idx, exit_idx, quantity, pnl, pnl_pct, capital)
+    where the trade arrays are truncated to n_trades and capital holds the
+    cash balance after each bar.
+    """
+    n = closes.size
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    quantity = np.empty(n, dtype=np.float64)
+    pnl = np.empty(n, dtype=np.float64)
+    pnl_pct = np.empty(n, dtype=np.float64)
+    capital = np.empty(n, dtype=np.float64)
+
+    entry_fee = 1.0 + commission + slippage
+    exit_fee = 1.0 - commission - slippage
+    stop_mult = 1.0 - stop_loss_pct
+    take_mult = 1.0 + take_profit_pct
+
+    current_capital = initial_capital
+    position_open = False
+    entry_price = 0.0
+    entry_ts = 0
+    qty = 0.0
+    n_trades = 0
+
+    for i in range(n):
+        price = closes[i]
+
+        if i >= warmup - 1:
+            score = scores[i]
+
+            if not position_open and score >= 60:
+                # Risk a confidence-scaled share of capital against the stop,
+                # capped at max_position_pct of capital
+                adjusted_risk = current_capital * risk_per_trade * (score / 100.0)
+                stop_distance = price * stop_loss_pct
+                qty = current_capital * max_position_pct / price
+                if stop_distance > 0:
+                    qty = min(adjusted_risk / stop_distance, qty)
+                current_capital -= qty * price * entry_fee
+                entry_price = price
+                entry_ts = ts_ns[i]
+                entry_idx[n_trades] = i
+                position_open = True
+
+            elif position_open and (
+                score < 40
+                or ts_ns[i] - entry_ts >= max_hold_ns
+                or price <= entry_price * stop_mult
+                or price >= entry_price * take_mult
+            ):
+                exit_value = qty * price * exit_fee
+                current_capital += exit_value
+
+                entry_value = qty * entry_price
+                exit_idx[n_trades] = i
+                quantity[n_trades] = qty
+                pnl[n_trades] = exit_value - entry_value
+                pnl_pct[n_trades] = (exit_value - entry_value) / entry_value * 100.0
+                n_trades += 1
+                position_open = False
+
+        capital[i] = current_capital
+
+    return (
+        n_trades,
+        entry_idx[:n_trades],
+        exit_idx[:n_trades],
+        quantity[:n_trades],
+        pnl[:n_trades],
+        pnl_pct[:n_trades],
+        capital
+    )
@@ -4,20 +4,312 @@ Strategy testing and performance analysis.
 """
 
 import asyncio
+import json
 import logging
+import math
+import os
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
-from decimal import Decimal
 
 import numpy as np
 import pandas as pd
 
+from ._indicators import RSI_PERIOD, wilder_rsi
+from ._kernels import NS_PER_HOUR, simulate
+
+try:
+    import polars as pl
+except ImportError:  # polars is optional; only the to_polars() helpers need it
+    pl = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; to_json() then falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; equity curves are then written as CSV
+    pa = pq = None
+
 logger = logging.getLogger(__name__)
 
+# Bars of history needed before the strategy emits a signal
+SIGNAL_WARMUP_BARS = 20
+
+# Exit after maximum hold time (7 days)
+MAX_HOLD_HOURS = 7 * 24
+
+# Limit position size to maximum 25% of capital
+MAX_POSITION_PCT = 0.25
+
+# Hourly bars, used to annualize risk-adjusted returns
+HOURS_PER_YEAR = 24 * 365
+
+# Signal labels by score band: a score at or above a threshold moves up one
+# label, so [0, 25) is STRONG_SELL, [25, 40) SELL, ... and [75, 100] STRONG_BUY
+_SIGNAL_THRESHOLDS = np.array([25, 40, 60, 75], dtype=np.int16)
+_SIGNAL_LABELS = np.array(["STRONG_SELL", "SELL", "HOLD", "BUY", "STRONG_BUY"])
+
+# Rows per chunk when writing an equity curve to disk
+EQUITY_CHUNK_ROWS = 1024
+
+# Starting prices for generated mock data
+_BASE_PRICES = {
+    "BTCUSDT": 50000.0,
+    "ETHUSDT": 3000.0,
+    "ADAUSDT": 1.20,
+    "DOTUSDT": 25.0,
+    "LINKUSDT": 20.0
+}
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` bars, NaN until the window is full"""
+    out = np.full(values.size, np.nan)
+    if values.size >= window:
+        out[window - 1:] = np.convolve(values, np.ones(window) / window, mode="valid")
+    return out
+
+def _require_polars():
+    if pl is None:
+        raise ImportError("polars is required for to_polars(); install it with `pip install polars`")
+    return pl
+
+def equity_metrics_polars(frame: "pl.DataFrame") -> Dict[str, float]:
+    """
+    Max drawdown (%), Sharpe and Sortino ratios from an equity curve frame.
+    
+    Same definitions as the Backtester's NumPy metrics, evaluated as polars
+    expressions over the columnar `capital` data.
+    """
+    _require_polars()
+    capital = pl.col("capital")
+    returns = (
+        frame.lazy()
+        .select(ret=capital.pct_change(), prev=capital.shift(1))
+        .filter(pl.col("prev") > 0)
+        .select("ret")
+        .collect()
+        .to_series()
+    )
+    
+    max_drawdown = 0.0
+    if frame.height >= 2:
+        max_drawdown = frame.select(
+            ((capital.cum_max() - capital) / capital.cum_max()).max()
+        ).item() * 100
+    
+    sharpe_ratio = sortino_ratio = 0.0
+    if returns.len() >= 2:
+        mean_return = returns.mean()
+        std_return = returns.std(ddof=1)
+        downside_deviation = returns.clip(upper_bound=0.0).pow(2).mean() ** 0.5
+        annualize = HOURS_PER_YEAR ** 0.5
+        if std_return:
+            sharpe_ratio = mean_return / std_return * annualize
+        if downside_deviation:
+            sortino_ratio = mean_return / downside_deviation * annualize
+        elif mean_return > 0:
+            sortino_ratio = float('inf')
+    
+    return {
+        "max_drawdown": max_drawdown,
+        "sharpe_ratio": sharpe_ratio,
+        "sortino_ratio": sortino_ratio
+    }
+
 @dataclass
+class EquityCurve:
+    """Per-bar capital and price stored column-wise as NumPy arrays"""
+    timestamps: np.ndarray  # datetime64[us]
+    capital: np.ndarray
+    price: np.ndarray
+    
+    def __len__(self) -> int:
+        return self.capital.size
+    
+    @classmethod
+    def empty(cls) -> "EquityCurve":
+        """Curve with no points"""
+        return cls(
+            timestamps=np.empty(0, dtype="datetime64[us]"),
+            capital=np.empty(0),
+            price=np.empty(0)
+        )
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert to a list of {timestamp, capital, price} points"""
+        return [
+            {
+                "timestamp": timestamp.isoformat(),
+                "capital": capital,
+                "price": price
+            }
+            for timestamp, capital, price in zip(
+                self.timestamps.tolist(), self.capital.tolist(), self.price.tolist()
+            )
+        ]
+    
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """Columns for JSON output, timestamps as integer nanoseconds"""
+        return {
+            "timestamp_ns": self.timestamps.astype("datetime64[ns]").view(np.int64),
+            "capital": self.capital,
+            "price": self.price
+        }
+    
+    def write(self, path: str, chunk_rows: int = EQUITY_CHUNK_ROWS) -> str:
+        """
+        Write the curve to `path` in chunks of `chunk_rows` rows.
+        
+        *.parquet paths are written with pyarrow, anything else as CSV.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        
+        if path.endswith(".parquet"):
+            if pq is None:
+                raise ImportError("pyarrow is required to write Parquet; install it with `pip install pyarrow`")
+            schema = pa.schema([
+                ("timestamp", pa.timestamp("us")),
+                ("capital", pa.float64()),
+                ("price", pa.float64())
+            ])
+            with pq.ParquetWriter(path, schema) as writer:
+                for start in range(0, len(self), chunk_rows):
+                    chunk = slice(start, start + chunk_rows)
+                    writer.write_table(pa.table({
+                        "timestamp": self.timestamps[chunk],
+                        "capital": self.capital[chunk],
+                        "price": self.price[chunk]
+                    }, schema=schema))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("timestamp,capital,price\n")
+                for start in range(0, len(self), chunk_rows):
+                    chunk = slice(start, start + chunk_rows)
+                    f.writelines(
+                        f"{timestamp},{capital!r},{price!r}\n"
+                        for timestamp, capital, price in zip(
+                            np.datetime_as_string(self.timestamps[chunk]).tolist(),
+                            self.capital[chunk].tolist(), self.price[chunk].tolist()
+                        )
+                    )
+        
+        return path
+    
+    def to_polars(self) -> "pl.DataFrame":
+        """Convert to a polars DataFrame with timestamp, capital and price columns"""
+        return _require_polars().DataFrame({
+            "timestamp": self.timestamps,
+            "capital": self.capital,
+            "price": self.price
+        })
+
+@dataclass(slots=True)
+class TradeBatch:
+    """Closed trades stored column-wise as NumPy arrays, one row per trade"""
+    symbol: str
+    entry_time: np.ndarray  # datetime64[us]
+    exit_time: np.ndarray  # datetime64[us]
+    quantity: np.ndarray
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    pnl: np.ndarray
+    pnl_pct: np.ndarray
+    signal_confidence: np.ndarray
+    side: str = "BUY"
+    
+    def __len__(self) -> int:
+        return self.pnl.size
+    
+    @classmethod
+    def empty(cls, symbol: str) -> "TradeBatch":
+        """Batch with no trades"""
+        return cls(
+            symbol=symbol,
+            entry_time=np.empty(0, dtype="datetime64[us]"),
+            exit_time=np.empty(0, dtype="datetime64[us]"),
+            quantity=np.empty(0),
+            entry_price=np.empty(0),
+            exit_price=np.empty(0),
+            pnl=np.empty(0),
+            pnl_pct=np.empty(0),
+            signal_confidence=np.empty(0, dtype=np.int16)
+        )
+    
+    @property
+    def duration_hours(self) -> np.ndarray:
+        return (self.exit_time - self.entry_time) / np.timedelta64(1, "h")
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert to a list of dicts shaped like Trade.to_dict()"""
+        return [
+            {
+                "entry_time": entry_time.isoformat(),
+                "exit_time": exit_time.isoformat(),
+                "symbol": self.symbol,
+                "side": self.side,
+                "quantity": quantity,
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "pnl": pnl,
+                "pnl_pct": pnl_pct,
+                "duration_hours": duration_hours,
+                "signal_confidence": signal_confidence
+            }
+            for (
+                entry_time, exit_time, quantity, entry_price, exit_price,
+                pnl, pnl_pct, duration_hours, signal_confidence
+            ) in zip(
+                self.entry_time.tolist(), self.exit_time.tolist(), self.quantity.tolist(),
+                self.entry_price.tolist(), self.exit_price.tolist(), self.pnl.tolist(),
+                self.pnl_pct.tolist(), self.duration_hours.tolist(), self.signal_confidence.tolist()
+            )
+        ]
+    
+    def to_columns(self) -> Dict[str, Any]:
+        """Columns for JSON output, times as integer nanoseconds"""
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "entry_ns": self.entry_time.astype("datetime64[ns]").view(np.int64),
+            "exit_ns": self.exit_time.astype("datetime64[ns]").view(np.int64),
+            "quantity": self.quantity,
+            "entry_price": self.entry_price,
+            "exit_price": self.exit_price,
+            "pnl": self.pnl,
+            "pnl_pct": self.pnl_pct,
+            "duration_hours": self.duration_hours,
+            "signal_confidence": self.signal_confidence
+        }
+    
+    def to_polars(self) -> "pl.DataFrame":
+        """Convert to a polars DataFrame with one row per trade"""
+        return _require_polars().DataFrame({
+            "entry_time": self.entry_time,
+            "exit_time": self.exit_time,
+            "quantity": self.quantity,
+            "entry_price": self.entry_price,
+            "exit_price": self.exit_price,
+            "pnl": self.pnl,
+            "pnl_pct": self.pnl_pct,
+            "duration_hours": self.duration_hours,
+            "signal_confidence": self.signal_confidence
+        })
+
+@dataclass(slots=True)
 class BacktestResult:
-    """Backtesting result metrics"""
+    """
+    Backtesting result metrics.
+    
+    Monetary fields are plain IEEE 754 floats; any Decimal conversion
+    belongs to the reporting layer at the JSON boundary.
+    """
     symbol: str
     start_date: datetime
     end_date: datetime
@@ -38,11 +330,12 @@ class BacktestResult:
     largest_win: float
     largest_loss: float
     avg_trade_duration: float
-    trades: List[Dict[str, Any]]
-    equity_curve: List[Dict[str, Any]]
+    trades: "TradeBatch"
+    equity_curve: EquityCurve
+    equity_path: Optional[str] = None  # Set when the curve was written to disk instead
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization"""
+    def _summary(self) -> Dict[str, Any]:
+        """Scalar metrics shared by to_dict() and to_json()"""
         return {
             "symbol": self.symbol,
             "start_date": self.start_date.isoformat(),
@@ -63,12 +356,53 @@ class BacktestResult:
             "avg_loss": self.avg_loss,
             "largest_win": self.largest_win,
             "largest_loss": self.largest_loss,
-            "avg_trade_duration": self.avg_trade_duration,
-            "trades": self.trades,
-            "equity_curve": self.equity_curve
+            "avg_trade_duration": self.avg_trade_duration
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Deprecated: trades and equity points become one dict each; use
+        to_json() for the columnar payload.
+        """
+        warnings.warn(
+            "BacktestResult.to_dict() is deprecated; use to_json()", DeprecationWarning, stacklevel=2
+        )
+        data = self._summary()
+        data["trades"] = self.trades.to_records()
+        if self.equity_path:
+            data["equity_curve_path"] = self.equity_path
+        else:
+            data["equity_curve"] = self.equity_curve.to_records()
+        return data
+    
+    def to_json(self) -> bytes:
+        """
+        Serialize to JSON bytes with trades and the equity curve as columns.
+        
+        Timestamps are integer nanoseconds since the epoch and non-finite
+        metrics (e.g. an infinite profit factor) are emitted as null.
+        """
+        data = {
+            name: None if isinstance(value, float) and not math.isfinite(value) else value
+            for name, value in self._summary().items()
         }
+        data["trades"] = self.trades.to_columns()
+        if self.equity_path:
+            data["equity_curve_path"] = self.equity_path
+        else:
+            data["equity_curve"] = self.equity_curve.to_columns()
+        
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(data, separators=(",", ":"), default=lambda value: value.tolist()).encode()
+    
+    def to_polars(self) -> "pl.DataFrame":
+        """Equity curve as a polars DataFrame, see equity_metrics_polars()"""
+        return self.equity_curve.to_polars()
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Individual trade record"""
     entry_time: datetime
@@ -99,274 +433,350 @@ class Trade:
             "signal_confidence": self.signal_confidence
         }
 
+@dataclass
+class PriceSeries:
+    """Hourly OHLCV history stored column-wise as NumPy arrays"""
+    timestamps: np.ndarray  # datetime64[us]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    def __len__(self) -> int:
+        return self.close.size
+    
+    @classmethod
+    def empty(cls) -> "PriceSeries":
+        """Series with no bars"""
+        return cls(
+            timestamps=np.empty(0, dtype="datetime64[us]"),
+            open=np.empty(0),
+            high=np.empty(0),
+            low=np.empty(0),
+            close=np.empty(0),
+            volume=np.empty(0)
+        )
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert to the list-of-candles shape used by _generate_signal"""
+        return [
+            {
+                "timestamp": timestamp,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume
+            }
+            for timestamp, open_, high, low, close, volume in zip(
+                self.timestamps.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist()
+            )
+        ]
+
+class SignalState:
+    """
+    Incremental form of the strategy signal for bar-by-bar (live) use.
+    
+    Keeps the last 20 bars in deques together with running sums for the
+    moving averages and volume average, plus Wilder's RSI averages, so each
+    update() is O(1) instead of re-slicing the whole history. Fed the same
+    bars, it reproduces wilder_rsi() exactly.
+    """
+    
+    def __init__(self):
+        self.prices = deque(maxlen=SIGNAL_WARMUP_BARS)
+        self.volumes = deque(maxlen=5)
+        self.sum_5 = 0.0
+        self.sum_10 = 0.0
+        self.sum_20 = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.rsi_changes = 0
+        self.volume_sum = 0.0
+    
+    def update(self, price: float, volume: float):
+        """Push the next bar's close and volume"""
+        prices = self.prices
+        n = len(prices)
+        
+        if n:
+            change = price - prices[-1]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            self.rsi_changes += 1
+            if self.rsi_changes <= RSI_PERIOD:
+                # Seed with a simple mean of the first RSI_PERIOD changes
+                self.avg_gain += gain
+                self.avg_loss += loss
+                if self.rsi_changes == RSI_PERIOD:
+                    self.avg_gain /= RSI_PERIOD
+                    self.avg_loss /= RSI_PERIOD
+            else:
+                self.avg_gain = (self.avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                self.avg_loss = (self.avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+        
+        # Drop the bar leaving each window before the deque evicts it
+        if n >= 5:
+            self.sum_5 -= prices[-5]
+        if n >= 10:
+            self.sum_10 -= prices[-10]
+        if n == SIGNAL_WARMUP_BARS:
+            self.sum_20 -= prices[0]
+        prices.append(price)
+        self.sum_5 += price
+        self.sum_10 += price
+        self.sum_20 += price
+        
+        if len(self.volumes) == 5:
+            self.volume_sum -= self.volumes[0]
+        self.volumes.append(volume)
+        self.volume_sum += volume
+    
+    def signal(self) -> Optional[Dict]:
+        """Current signal, or None until 20 bars have been seen"""
+        prices = self.prices
+        if len(prices) < SIGNAL_WARMUP_BARS:
+            return None
+        
+        sma_5 = self.sum_5 / 5
+        sma_10 = self.sum_10 / 10
+        sma_20 = self.sum_20 / 20
+        current_price = prices[-1]
+        
+        # Wilder's RSI
+        if self.avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+        
+        # Volume analysis
+        volume_sma = self.volume_sum / 5
+        volume_ratio = self.volumes[-1] / volume_sma if volume_sma > 0 else 1
+        
+        # Generate signal based on multiple factors
+        score = 50  # Neutral starting point
+        
+        # Moving average signals
+        if current_price > sma_5 > sma_10 > sma_20:
+            score += 20  # Strong uptrend
+        elif current_price > sma_5 > sma_10:
+            score += 10  # Uptrend
+        elif current_price < sma_5 < sma_10 < sma_20:
+            score -= 20  # Strong downtrend
+        elif current_price < sma_5 < sma_10:
+            score -= 10  # Downtrend
+        
+        # RSI signals
+        if rsi < 30:
+            score += 15  # Oversold
+        elif rsi > 70:
+            score -= 15  # Overbought
+        
+        # Volume confirmation
+        if volume_ratio > 1.5:
+            score += 10  # High volume confirmation
+        elif volume_ratio < 0.5:
+            score -= 5   # Low volume warning
+        
+        # Momentum
+        recent_change = (current_price - prices[-5]) / prices[-5] * 100
+        if recent_change > 2:
+            score += 10
+        elif recent_change < -2:
+            score -= 10
+        
+        return {
+            "signal": Backtester._score_to_signal(score),
+            "confidence": score,
+            "rsi": rsi,
+            "sma_5": sma_5,
+            "sma_10": sma_10,
+            "volume_ratio": volume_ratio,
+            "price": current_price
+        }
+
 class Backtester:
     """Strategy backtesting engine"""
     
     def __init__(self):
+        self.rng = np.random.default_rng()
         self.initial_capital = 10000.0
         self.commission = 0.001  # 0.1% commission per trade
         self.slippage = 0.0005   # 0.05% slippage
         self.risk_per_trade = 0.02  # 2% risk per trade
+        self.stop_loss_pct = 0.05  # 5% stop loss
+        self.take_profit_pct = 0.10  # 10% take profit
         
     async def run_backtest(
         self, 
         symbol: str, 
         days: int = 30,
-        strategy_params: Optional[Dict] = None
+        strategy_params: Optional[Dict] = None,
+        equity_path: Optional[str] = None
     ) -> Optional[BacktestResult]:
-        """Run backtest for a symbol"""
+        """
+        Run backtest for a symbol.
+        
+        With `equity_path` the equity curve is written there (see
+        EquityCurve.write) and dropped from the returned result, which keeps
+        only the metrics, trades and the path.
+        """
         try:
             logger.info(f"Starting backtest for {symbol} over {days} days")
             
-            # Generate mock historical data (in production, fetch from database/API)
-            historical_data = await self._generate_mock_data(symbol, days)
-            if not historical_data:
+            historical_data = await self._fetch(symbol, days)
+            if len(historical_data) == 0:
                 return None
             
-            # Run strategy simulation
-            trades = []
-            equity_curve = []
-            current_capital = self.initial_capital
-            position = None
-            
-            for i, candle in enumerate(historical_data):
-                timestamp = candle["timestamp"]
-                price = candle["close"]
-                
-                # Generate trading signal (using simplified version of main algorithm)
-                signal_data = self._generate_signal(historical_data[:i+1])
-                
-                if signal_data:
-                    signal = signal_data["signal"]
-                    confidence = signal_data["confidence"]
-                    
-                    # Entry logic
-                    if position is None and signal in ["BUY", "STRONG_BUY"]:
-                        position_size = self._calculate_position_size(
-                            current_capital, price, confidence
-                        )
-                        
-                        position = {
-                            "entry_time": timestamp,
-                            "entry_price": price,
-                            "quantity": position_size,
-                            "confidence": confidence
-                        }
-                        
-                        # Apply commission and slippage
-                        entry_cost = position_size * price * (1 + self.commission + self.slippage)
-                        current_capital -= entry_cost
-                    
-                    # Exit logic
-                    elif position is not None:
-                        should_exit = False
-                        
-                        # Exit on opposite signal
-                        if signal in ["SELL", "STRONG_SELL"]:
-                            should_exit = True
-                        
-                        # Exit after maximum hold time (7 days)
-                        elif (timestamp - position["entry_time"]).days >= 7:
-                            should_exit = True
-                        
-                        # Stop loss (5% loss)
-                        elif price <= position["entry_price"] * 0.95:
-                            should_exit = True
-                        
-                        # Take profit (10% gain)
-                        elif price >= position["entry_price"] * 1.10:
-                            should_exit = True
-                        
-                        if should_exit:
-                            # Close position
-                            exit_value = position["quantity"] * price * (1 - self.commission - self.slippage)
-                            current_capital += exit_value
-                            
-                            # Calculate trade P&L
-                            entry_value = position["quantity"] * position["entry_price"]
-                            trade_pnl = exit_value - entry_value
-                            trade_pnl_pct = trade_pnl / entry_value * 100
-                            
-                            # Create trade record
-                            trade = Trade(
-                                entry_time=position["entry_time"],
-                                exit_time=timestamp,
-                                symbol=symbol,
-                                side="BUY",
-                                quantity=position["quantity"],
-                                entry_price=position["entry_price"],
-                                exit_price=price,
-                                pnl=trade_pnl,
-                                pnl_pct=trade_pnl_pct,
-                                duration_hours=(timestamp - position["entry_time"]).total_seconds() / 3600,
-                                signal_confidence=position["confidence"]
-                            )
-                            
-                            trades.append(trade)
-                            position = None
-                
-                # Record equity curve point
-                equity_curve.append({
-                    "timestamp": timestamp.isoformat(),
-                    "capital": current_capital,
-                    "price": price
-                })
+            # Score every bar up front instead of re-deriving indicators per bar
+            scores = self._compute_signal_scores(historical_data.close, historical_data.volume)
             
-            # Calculate backtest results
-            result = self._calculate_backtest_results(
-                symbol, historical_data[0]["timestamp"], historical_data[-1]["timestamp"],
-                self.initial_capital, current_capital, trades, equity_curve
-            )
+            result = self._simulate(symbol, historical_data, scores)
+            if equity_path:
+                result.equity_path = result.equity_curve.write(equity_path)
+                result.equity_curve = EquityCurve.empty()
             
             logger.info(f"Backtest completed for {symbol}: {result.total_return_pct:.2f}% return")
             return result
             
-        except Exception as e:
-            logger.error(f"Error running backtest: {str(e)}")
+        except Exception:
+            logger.exception(f"Error running backtest for {symbol} over {days} days")
             return None
     
-    async def _generate_mock_data(self, symbol: str, days: int) -> List[Dict[str, Any]]:
+    async def _fetch(self, symbol: str, days: int) -> "PriceSeries":
+        """Load the price history a backtest runs over"""
+        # Generate mock historical data (in production, fetch from database/API)
+        return await self._generate_mock_data(symbol, days)
+    
+    def _simulate(self, symbol: str, historical_data: "PriceSeries", scores: np.ndarray) -> BacktestResult:
+        """Run the strategy over pre-scored bars with this Backtester's parameters"""
+        closes = historical_data.close
+        ts_ns = historical_data.timestamps.astype("datetime64[ns]").view(np.int64)
+        assert closes.dtype == np.float64, "simulation runs on float64 prices"
+        (
+            n_trades, entry_idx, exit_idx, quantity, pnl, pnl_pct, capital
+        ) = simulate(
+            closes, ts_ns, scores, SIGNAL_WARMUP_BARS,
+            self.initial_capital, self.commission, self.slippage,
+            self.risk_per_trade, self.stop_loss_pct, self.take_profit_pct,
+            MAX_POSITION_PCT, MAX_HOLD_HOURS * NS_PER_HOUR
+        )
+        current_capital = float(capital[-1])
+        
+        trades = TradeBatch(
+            symbol=symbol,
+            entry_time=historical_data.timestamps[entry_idx],
+            exit_time=historical_data.timestamps[exit_idx],
+            quantity=quantity,
+            entry_price=closes[entry_idx],
+            exit_price=closes[exit_idx],
+            pnl=pnl,
+            pnl_pct=pnl_pct,
+            signal_confidence=scores[entry_idx]
+        )
+        
+        equity_curve = EquityCurve(
+            timestamps=historical_data.timestamps,
+            capital=capital,
+            price=closes
+        )
+        
+        # Calculate backtest results
+        return self._calculate_backtest_results(
+            symbol, historical_data.timestamps[0].item(), historical_data.timestamps[-1].item(),
+            self.initial_capital, current_capital, trades, equity_curve
+        )
+    
+    async def _generate_mock_data(self, symbol: str, days: int) -> "PriceSeries":
         """Generate mock historical data for backtesting"""
-        try:
-            # Start with a base price
-            base_prices = {
-                "BTCUSDT": 50000.0,
-                "ETHUSDT": 3000.0,
-                "ADAUSDT": 1.20,
-                "DOTUSDT": 25.0,
-                "LINKUSDT": 20.0
-            }
-            
-            start_price = base_prices.get(symbol, 100.0)
-            data = []
-            current_price = start_price
-            
-            # Generate hourly data
-            start_date = datetime.utcnow() - timedelta(days=days)
-            
-            for hour in range(days * 24):
-                timestamp = start_date + timedelta(hours=hour)
-                
-                # Random walk with slight upward bias
-                change_pct = np.random.normal(0.0005, 0.02)  # 0.05% mean, 2% std
-                current_price *= (1 + change_pct)
-                
-                # Add some volatility
-                high = current_price * (1 + abs(np.random.normal(0, 0.01)))
-                low = current_price * (1 - abs(np.random.normal(0, 0.01)))
-                volume = np.random.uniform(1000, 10000)
-                
-                candle = {
-                    "timestamp": timestamp,
-                    "open": current_price,
-                    "high": high,
-                    "low": low,
-                    "close": current_price,
-                    "volume": volume
-                }
-                
-                data.append(candle)
-            
-            return data
-            
-        except Exception as e:
-            logger.error(f"Error generating mock data: {str(e)}")
-            return []
+        # Start with a base price
+        start_price = _BASE_PRICES.get(symbol, 100.0)
+        n = days * 24
+        
+        # Generate hourly data
+        start_date = datetime.utcnow() - timedelta(days=days)
+        timestamps = np.datetime64(start_date, "us") + np.arange(n) * np.timedelta64(1, "h")
+        
+        # Random walk with slight upward bias (0.05% mean, 2% std), plus
+        # intrabar volatility for the highs and lows
+        z = self.rng.standard_normal((n, 3))
+        closes = start_price * np.cumprod(1.0 + (0.0005 + 0.02 * z[:, 0]))
+        highs = closes * (1.0 + np.abs(0.01 * z[:, 1]))
+        lows = closes * (1.0 - np.abs(0.01 * z[:, 2]))
+        volumes = self.rng.uniform(1000, 10000, n)
+        
+        return PriceSeries(
+            timestamps=timestamps,
+            open=closes,
+            high=highs,
+            low=lows,
+            close=closes,
+            volume=volumes
+        )
+    
+    def _compute_signal_scores(self, closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        """Vectorized equivalent of _generate_signal's score for every bar.
+        
+        Entry i holds the score computed from bars [i-19, i]; entries before
+        the 20-bar warm-up are left at the neutral 50.
+        """
+        n = closes.size
+        scores = np.full(n, 50, dtype=np.int16)
+        if n < SIGNAL_WARMUP_BARS:
+            return scores
+        
+        sma_5 = _rolling_mean(closes, 5)
+        sma_10 = _rolling_mean(closes, 10)
+        sma_20 = _rolling_mean(closes, 20)
+        
+        rsi = wilder_rsi(closes, RSI_PERIOD)
+        
+        volume_sma = _rolling_mean(volumes, 5)
+        volume_ratio = np.divide(volumes, volume_sma, out=np.ones(n), where=volume_sma > 0)
+        
+        momentum = np.zeros(n)
+        momentum[4:] = (closes[4:] - closes[:-4]) / closes[:-4] * 100
+        
+        # Moving average signals (first matching trend rule wins)
+        strong_up = (closes > sma_5) & (sma_5 > sma_10) & (sma_10 > sma_20)
+        up = (closes > sma_5) & (sma_5 > sma_10)
+        strong_down = (closes < sma_5) & (sma_5 < sma_10) & (sma_10 < sma_20)
+        down = (closes < sma_5) & (sma_5 < sma_10)
+        trend = np.select([strong_up, up, strong_down, down], [20, 10, -20, -10], 0)
+        
+        # RSI, volume confirmation and momentum
+        trend += np.where(rsi < 30, 15, np.where(rsi > 70, -15, 0))
+        trend += np.where(volume_ratio > 1.5, 10, np.where(volume_ratio < 0.5, -5, 0))
+        trend += np.where(momentum > 2, 10, np.where(momentum < -2, -10, 0))
+        
+        warm = slice(SIGNAL_WARMUP_BARS - 1, None)
+        scores[warm] += trend[warm].astype(np.int16)
+        return scores
+    
+    @staticmethod
+    def _signal_codes(scores: np.ndarray) -> np.ndarray:
+        """Map 0-100 signal scores to label codes, 0 (STRONG_SELL) to 4 (STRONG_BUY)"""
+        return np.searchsorted(_SIGNAL_THRESHOLDS, scores, side="right")
+    
+    @staticmethod
+    def _signal_labels(scores: np.ndarray) -> np.ndarray:
+        """Map 0-100 signal scores to their labels"""
+        return _SIGNAL_LABELS[Backtester._signal_codes(scores)]
+    
+    @staticmethod
+    def _score_to_signal(score: float) -> str:
+        """Map a 0-100 signal score to its label"""
+        return str(_SIGNAL_LABELS[Backtester._signal_codes(score)])
     
     def _generate_signal(self, historical_data: List[Dict]) -> Optional[Dict]:
         """Generate trading signal from historical data"""
-        try:
-            if len(historical_data) < 20:
-                return None
-            
-            # Get recent prices
-            prices = [candle["close"] for candle in historical_data[-20:]]
-            volumes = [candle["volume"] for candle in historical_data[-20:]]
-            
-            # Simple moving averages
-            sma_5 = sum(prices[-5:]) / 5
-            sma_10 = sum(prices[-10:]) / 10
-            sma_20 = sum(prices[-20:]) / 20
-            
-            current_price = prices[-1]
-            
-            # RSI calculation (simplified)
-            gains = []
-            losses = []
-            for i in range(1, len(prices)):
-                change = prices[i] - prices[i-1]
-                if change > 0:
-                    gains.append(change)
-                    losses.append(0)
-                else:
-                    gains.append(0)
-                    losses.append(abs(change))
-            
-            avg_gain = sum(gains[-14:]) / 14 if len(gains) >= 14 else 0
-            avg_loss = sum(losses[-14:]) / 14 if len(losses) >= 14 else 0.001
-            rsi = 100 - (100 / (1 + (avg_gain / avg_loss)))
-            
-            # Volume analysis
-            volume_sma = sum(volumes[-5:]) / 5
-            volume_ratio = volumes[-1] / volume_sma if volume_sma > 0 else 1
-            
-            # Generate signal based on multiple factors
-            score = 50  # Neutral starting point
-            
-            # Moving average signals
-            if current_price > sma_5 > sma_10 > sma_20:
-                score += 20  # Strong uptrend
-            elif current_price > sma_5 > sma_10:
-                score += 10  # Uptrend
-            elif current_price < sma_5 < sma_10 < sma_20:
-                score -= 20  # Strong downtrend
-            elif current_price < sma_5 < sma_10:
-                score -= 10  # Downtrend
-            
-            # RSI signals
-            if rsi < 30:
-                score += 15  # Oversold
-            elif rsi > 70:
-                score -= 15  # Overbought
-            
-            # Volume confirmation
-            if volume_ratio > 1.5:
-                score += 10  # High volume confirmation
-            elif volume_ratio < 0.5:
-                score -= 5   # Low volume warning
-            
-            # Momentum
-            recent_change = (current_price - prices[-5]) / prices[-5] * 100
-            if recent_change > 2:
-                score += 10
-            elif recent_change < -2:
-                score -= 10
-            
-            # Determine signal
-            if score >= 75:
-                signal = "STRONG_BUY"
-            elif score >= 60:
-                signal = "BUY"
-            elif score >= 40:
-                signal = "HOLD"
-            elif score >= 25:
-                signal = "SELL"
-            else:
-                signal = "STRONG_SELL"
-            
-            return {
-                "signal": signal,
-                "confidence": score,
-                "rsi": rsi,
-                "sma_5": sma_5,
-                "sma_10": sma_10,
-                "volume_ratio": volume_ratio,
-                "price": current_price
-            }
-            
-        except Exception as e:
-            logger.error(f"Error generating signal: {str(e)}")
-            return None
+        # Wilder's RSI depends on the whole history, so replay every bar
+        state = SignalState()
+        for candle in historical_data:
+            state.update(candle["close"], candle["volume"])
+        return state.signal()
     
     def _calculate_position_size(
         self, 
@@ -375,27 +785,27 @@ class Backtester:
         confidence: float
     ) -> float:
         """Calculate position size based on capital and confidence"""
-        try:
-            # Base risk per trade
-            risk_amount = capital * self.risk_per_trade
-            
-            # Adjust based on confidence
-            confidence_multiplier = confidence / 100  # Scale confidence to 0-1
-            adjusted_risk = risk_amount * confidence_multiplier
-            
-            # Calculate position size (assuming 5% stop loss)
-            stop_loss_pct = 0.05
-            position_size = adjusted_risk / (price * stop_loss_pct)
-            
-            # Limit position size to maximum 25% of capital
-            max_position_value = capital * 0.25
-            max_position_size = max_position_value / price
-            
-            return min(position_size, max_position_size)
-            
-        except Exception as e:
-            logger.error(f"Error calculating position size: {str(e)}")
+        # Base risk per trade
+        risk_amount = capital * self.risk_per_trade
+        
+        # Adjust based on confidence
+        confidence_multiplier = confidence / 100  # Scale confidence to 0-1
+        adjusted_risk = risk_amount * confidence_multiplier
+        
+        if price <= 0:
             return 0.0
+        
+        # Limit position size to maximum 25% of capital
+        max_position_value = capital * MAX_POSITION_PCT
+        max_position_size = max_position_value / price
+        
+        # Calculate position size against the stop loss distance
+        stop_distance = price * self.stop_loss_pct
+        if stop_distance <= 0:
+            return max_position_size
+        position_size = adjusted_risk / stop_distance
+        
+        return min(position_size, max_position_size)
     
     def _calculate_backtest_results(
         self,
@@ -404,184 +814,165 @@ class Backtester:
         end_date: datetime,
         initial_capital: float,
         final_capital: float,
-        trades: List[Trade],
-        equity_curve: List[Dict]
+        trades: "TradeBatch",
+        equity_curve: EquityCurve
     ) -> BacktestResult:
         """Calculate comprehensive backtest results"""
-        try:
-            # Basic metrics
-            total_return = final_capital - initial_capital
-            total_return_pct = total_return / initial_capital * 100
-            
-            # Trade statistics
-            total_trades = len(trades)
-            winning_trades = len([t for t in trades if t.pnl > 0])
-            losing_trades = len([t for t in trades if t.pnl < 0])
-            win_rate = winning_trades / total_trades * 100 if total_trades > 0 else 0
-            
-            # P&L statistics
-            winning_pnls = [t.pnl for t in trades if t.pnl > 0]
-            losing_pnls = [t.pnl for t in trades if t.pnl < 0]
-            
-            avg_win = sum(winning_pnls) / len(winning_pnls) if winning_pnls else 0
-            avg_loss = sum(losing_pnls) / len(losing_pnls) if losing_pnls else 0
-            largest_win = max(winning_pnls) if winning_pnls else 0
-            largest_loss = min(losing_pnls) if losing_pnls else 0
-            
-            # Profit factor
-            gross_profit = sum(winning_pnls)
-            gross_loss = abs(sum(losing_pnls))
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
-            
-            # Average trade duration
-            durations = [t.duration_hours for t in trades]
-            avg_trade_duration = sum(durations) / len(durations) if durations else 0
-            
-            # Calculate max drawdown from equity curve
-            max_drawdown = self._calculate_max_drawdown_from_curve(equity_curve)
-            
-            # Calculate Sharpe and Sortino ratios
-            returns = self._calculate_returns_from_curve(equity_curve)
-            sharpe_ratio = self._calculate_sharpe_ratio(returns)
-            sortino_ratio = self._calculate_sortino_ratio(returns)
-            
-            return BacktestResult(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                initial_capital=initial_capital,
-                final_capital=final_capital,
-                total_return=total_return,
-                total_return_pct=total_return_pct,
-                max_drawdown=max_drawdown,
-                sharpe_ratio=sharpe_ratio,
-                sortino_ratio=sortino_ratio,
-                win_rate=win_rate,
-                profit_factor=profit_factor,
-                total_trades=total_trades,
-                winning_trades=winning_trades,
-                losing_trades=losing_trades,
-                avg_win=avg_win,
-                avg_loss=avg_loss,
-                largest_win=largest_win,
-                largest_loss=largest_loss,
-                avg_trade_duration=avg_trade_duration,
-                trades=[t.to_dict() for t in trades],
-                equity_curve=equity_curve
-            )
-            
-        except Exception as e:
-            logger.error(f"Error calculating backtest results: {str(e)}")
-            return BacktestResult(
-                symbol, start_date, end_date, initial_capital, final_capital,
-                0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, [], []
-            )
+        # Basic metrics
+        total_return = final_capital - initial_capital
+        total_return_pct = total_return / initial_capital * 100 if initial_capital else 0.0
+        
+        # Trade statistics, derived from one P&L array
+        pnls = trades.pnl
+        durations = trades.duration_hours
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls < 0]
+        
+        total_trades = pnls.size
+        winning_trades = wins.size
+        losing_trades = losses.size
+        win_rate = winning_trades / total_trades * 100 if total_trades > 0 else 0
+        
+        # P&L statistics
+        avg_win = float(wins.mean()) if winning_trades else 0
+        avg_loss = float(losses.mean()) if losing_trades else 0
+        largest_win = float(wins.max()) if winning_trades else 0
+        largest_loss = float(losses.min()) if losing_trades else 0
+        
+        # Profit factor
+        gross_profit = float(wins.sum())
+        gross_loss = float(-losses.sum())
+        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+        
+        # Average trade duration
+        avg_trade_duration = float(durations.mean()) if total_trades else 0
+        
+        # Calculate max drawdown from equity curve
+        max_drawdown = self._calculate_max_drawdown_from_curve(equity_curve.capital)
+        
+        # Calculate Sharpe and Sortino ratios
+        returns = self._calculate_returns_from_curve(equity_curve.capital)
+        sharpe_ratio = self._calculate_sharpe_ratio(returns)
+        sortino_ratio = self._calculate_sortino_ratio(returns)
+        
+        return BacktestResult(
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            initial_capital=initial_capital,
+            final_capital=final_capital,
+            total_return=total_return,
+            total_return_pct=total_return_pct,
+            max_drawdown=max_drawdown,
+            sharpe_ratio=sharpe_ratio,
+            sortino_ratio=sortino_ratio,
+            win_rate=win_rate,
+            profit_factor=profit_factor,
+            total_trades=total_trades,
+            winning_trades=winning_trades,
+            losing_trades=losing_trades,
+            avg_win=avg_win,
+            avg_loss=avg_loss,
+            largest_win=largest_win,
+            largest_loss=largest_loss,
+            avg_trade_duration=avg_trade_duration,
+            trades=trades,
+            equity_curve=equity_curve
+        )
     
-    def _calculate_max_drawdown_from_curve(self, equity_curve: List[Dict]) -> float:
-        """Calculate maximum drawdown from equity curve"""
-        try:
-            if len(equity_curve) < 2:
-                return 0.0
-            
-            capitals = [point["capital"] for point in equity_curve]
-            peak = capitals[0]
-            max_dd = 0.0
-            
-            for capital in capitals:
-                if capital > peak:
-                    peak = capital
-                
-                drawdown = (peak - capital) / peak
-                if drawdown > max_dd:
-                    max_dd = drawdown
-            
-            return max_dd * 100  # Return as percentage
-            
-        except Exception as e:
-            logger.error(f"Error calculating max drawdown: {str(e)}")
+    def _calculate_max_drawdown_from_curve(self, capitals: np.ndarray) -> float:
+        """Calculate maximum drawdown from the equity curve's capital values"""
+        if capitals.size < 2:
             return 0.0
+        
+        peaks = np.maximum.accumulate(capitals)
+        drawdowns = np.divide(peaks - capitals, peaks, out=np.zeros_like(capitals), where=peaks > 0)
+        
+        return float(drawdowns.max()) * 100  # Return as percentage
     
-    def _calculate_returns_from_curve(self, equity_curve: List[Dict]) -> List[float]:
-        """Calculate returns from equity curve"""
-        try:
-            if len(equity_curve) < 2:
-                return []
-            
-            returns = []
-            capitals = [point["capital"] for point in equity_curve]
-            
-            for i in range(1, len(capitals)):
-                if capitals[i-1] > 0:
-                    daily_return = (capitals[i] - capitals[i-1]) / capitals[i-1]
-                    returns.append(daily_return)
-            
-            return returns
-            
-        except Exception as e:
-            logger.error(f"Error calculating returns: {str(e)}")
-            return []
+    def _calculate_returns_from_curve(self, capitals: np.ndarray) -> np.ndarray:
+        """Calculate per-bar returns from the equity curve's capital values"""
+        if capitals.size < 2:
+            return np.empty(0)
+        
+        # Returns are only defined where the previous capital is positive
+        prev = capitals[:-1]
+        valid = prev > 0
+        return (capitals[1:][valid] - prev[valid]) / prev[valid]
     
-    def _calculate_sharpe_ratio(self, returns: List[float]) -> float:
-        """Calculate Sharpe ratio"""
-        try:
-            if len(returns) < 2:
-                return 0.0
-            
-            mean_return = np.mean(returns)
-            std_return = np.std(returns)
-            
-            if std_return == 0:
-                return 0.0
-            
-            # Annualized Sharpe ratio (assuming hourly returns)
-            sharpe = (mean_return * 24 * 365) / (std_return * np.sqrt(24 * 365))
-            return sharpe
-            
-        except Exception as e:
-            logger.error(f"Error calculating Sharpe ratio: {str(e)}")
+    def _calculate_sharpe_ratio(self, returns: np.ndarray) -> float:
+        """Calculate annualized Sharpe ratio from hourly returns"""
+        if returns.size < 2:
+            return 0.0
+        
+        mean_return = returns.mean()
+        std_return = returns.std(ddof=1)
+        
+        if std_return == 0:
             return 0.0
+        
+        # Risk-free rate of 0; scale the per-period ratio by sqrt(periods per year)
+        return float(mean_return / std_return * np.sqrt(HOURS_PER_YEAR))
     
-    def _calculate_sortino_ratio(self, returns: List[float]) -> float:
-        """Calculate Sortino ratio"""
-        try:
-            if len(returns) < 2:
-                return 0.0
-            
-            mean_return = np.mean(returns)
-            negative_returns = [r for r in returns if r < 0]
-            
-            if not negative_returns:
-                return float('inf')
-            
-            downside_deviation = np.std(negative_returns)
-            
-            if downside_deviation == 0:
-                return 0.0
-            
-            # Annualized Sortino ratio
-            sortino = (mean_return * 24 * 365) / (downside_deviation * np.sqrt(24 * 365))
-            return sortino
-            
-        except Exception as e:
-            logger.error(f"Error calculating Sortino ratio: {str(e)}")
+    def _calculate_sortino_ratio(self, returns: np.ndarray) -> float:
+        """Calculate annualized Sortino ratio from hourly returns"""
+        if returns.size < 2:
             return 0.0
+        
+        mean_return = returns.mean()
+        
+        # Downside semi-deviation with a minimum acceptable return of 0
+        downside_deviation = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+        
+        if downside_deviation == 0:
+            return float('inf') if mean_return > 0 else 0.0
+        
+        return float(mean_return / downside_deviation * np.sqrt(HOURS_PER_YEAR))
+    
+    def _strategy_params(self) -> Dict[str, float]:
+        """Current simulation parameters, for recreating this Backtester in a worker"""
+        return {
+            "initial_capital": self.initial_capital,
+            "commission": self.commission,
+            "slippage": self.slippage,
+            "risk_per_trade": self.risk_per_trade,
+            "stop_loss_pct": self.stop_loss_pct,
+            "take_profit_pct": self.take_profit_pct
+        }
     
     async def run_multi_symbol_backtest(
         self, 
         symbols: List[str], 
-        days: int = 30
+        days: int = 30,
+        runs_dir: Optional[str] = None
     ) -> Dict[str, BacktestResult]:
-        """Run backtest for multiple symbols"""
+        """
+        Run backtest for multiple symbols.
+        
+        With `runs_dir` each symbol's equity curve is written to
+        runs_dir/{symbol}.parquet (or .csv without pyarrow) instead of being
+        returned in memory.
+        """
         results = {}
         
         try:
-            # Run backtests in parallel
-            tasks = []
-            for symbol in symbols:
-                task = self.run_backtest(symbol, days)
-                tasks.append(task)
-            
-            backtest_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Backtests are CPU-bound, so run each symbol in its own process
+            loop = asyncio.get_running_loop()
+            params = self._strategy_params()
+            
+            with ProcessPoolExecutor() as executor:
+                tasks = []
+                for symbol in symbols:
+                    equity_path = None
+                    if runs_dir:
+                        extension = "parquet" if pq is not None else "csv"
+                        equity_path = os.path.join(runs_dir, f"{symbol}.{extension}")
+                    task = loop.run_in_executor(
+                        executor, _run_backtest_in_process, symbol, days, params, equity_path
+                    )
+                    tasks.append(task)
+                
+                backtest_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             for i, result in enumerate(backtest_results):
                 symbol = symbols[i]
@@ -616,39 +1007,42 @@ class Backtester:
             best_return = -float('inf')
             results = []
             
-            # Grid search
-            for risk in parameter_ranges["risk_per_trade"]:
-                for stop_loss in parameter_ranges["stop_loss_pct"]:
-                    for take_profit in parameter_ranges["take_profit_pct"]:
-                        # Temporarily set parameters
-                        original_risk = self.risk_per_trade
-                        self.risk_per_trade = risk
-                        
-                        # Run backtest
-                        result = await self.run_backtest(symbol, days)
-                        
-                        # Restore original parameter
-                        self.risk_per_trade = original_risk
-                        
-                        if result and result.total_return_pct > best_return:
-                            best_return = result.total_return_pct
-                            best_params = {
-                                "risk_per_trade": risk,
-                                "stop_loss_pct": stop_loss,
-                                "take_profit_pct": take_profit
-                            }
-                        
-                        if result:
-                            results.append({
-                                "parameters": {
-                                    "risk_per_trade": risk,
-                                    "stop_loss_pct": stop_loss,
-                                    "take_profit_pct": take_profit
-                                },
-                                "return_pct": result.total_return_pct,
-                                "sharpe_ratio": result.sharpe_ratio,
-                                "max_drawdown": result.max_drawdown
-                            })
+            grid = [
+                {
+                    "risk_per_trade": risk,
+                    "stop_loss_pct": stop_loss,
+                    "take_profit_pct": take_profit
+                }
+                for risk in parameter_ranges["risk_per_trade"]
+                for stop_loss in parameter_ranges["stop_loss_pct"]
+                for take_profit in parameter_ranges["take_profit_pct"]
+            ]
+            
+            # The parameters only affect the simulation, so fetch and score
+            # the price history once and re-run just the strategy per grid point
+            historical_data = await self._fetch(symbol, days)
+            if len(historical_data) == 0:
+                return {}
+            scores = self._compute_signal_scores(historical_data.close, historical_data.volume)
+            
+            base_params = self._strategy_params()
+            grid_results = [
+                _backtester_with({**base_params, **parameters})._simulate(symbol, historical_data, scores)
+                for parameters in grid
+            ]
+            
+            for parameters, result in zip(grid, grid_results):
+                if result and result.total_return_pct > best_return:
+                    best_return = result.total_return_pct
+                    best_params = parameters
+                
+                if result:
+                    results.append({
+                        "parameters": parameters,
+                        "return_pct": result.total_return_pct,
+                        "sharpe_ratio": result.sharpe_ratio,
+                        "max_drawdown": result.max_drawdown
+                    })
             
             return {
                 "best_parameters": best_params,
@@ -658,4 +1052,20 @@ class Backtester:
             
         except Exception as e:
             logger.error(f"Error optimizing strategy parameters: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
+
+def _run_backtest_in_process(
+    symbol: str,
+    days: int,
+    params: Dict[str, float],
+    equity_path: Optional[str] = None
+) -> Optional[BacktestResult]:
+    """Run a single backtest with the given parameters; executed in a worker process"""
+    return asyncio.run(_backtester_with(params).run_backtest(symbol, days, equity_path=equity_path))
+
+def _backtester_with(params: Dict[str, float]) -> Backtester:
+    """New Backtester with the given simulation parameters applied"""
+    backtester = Backtester()
+    for name, value in params.items():
+        setattr(backtester, name, value)
+    return backtester
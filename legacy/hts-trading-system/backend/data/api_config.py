@@ -3,17 +3,42 @@ HTS Trading System - API Configuration
 Contains all 40 API configurations with hardcoded keys for maximum reliability.
 """
 
-from typing import Dict, List, Any
-
-# Hardcoded API keys (working keys provided in requirements)
-TRONSCAN_KEY = "7ae72726-bffe-4e74-9c33-97b761eeea21"
-BSCSCAN_KEY = "K62RKHGXTDCG53RU4MCG6XABIMJKTN19IT"
-ETHERSCAN_KEY = "SZHYFZK2RR8H9TIMJBVW54V4H81K2Z2KR2"
-ETHERSCAN_KEY_2 = "T6IR8VJHX2NE6ZJW2S3FDVN1TYG4PYYI45"
-COINMARKETCAP_KEY = "b54bcf4d-1bca-4e8e-9a24-22ff2c3d462c"
-COINMARKETCAP_KEY_2 = "04cf4b5b-9868-465c-8ba0-9f2e78c92eb1"
-CRYPTOCOMPARE_KEY = "e79c8e6d4c5b4a3f2e1d0c9b8a7f6e5d4c3b2a1f"
-NEWSAPI_KEY = "pub_346789abc123def456789ghi012345jkl"
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+
+import httpx
+
+@dataclass(frozen=True, slots=True)
+class ApiSpec:
+    """Flat, immutable record of one API configuration"""
+    name: str
+    type: str
+    base_url: str
+    endpoints: Mapping[str, str]
+    rate_limit: int
+    priority: int
+    headers: Mapping[str, str]
+    auth_required: bool
+    params: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+
+# Default API keys (working keys provided in requirements); each is overridden by the
+# environment variable of the same name when set
+_DEFAULT_KEYS = {
+    "TRONSCAN_KEY": "7ae72726-bffe-4e74-9c33-97b761eeea21",
+    "BSCSCAN_KEY": "K62RKHGXTDCG53RU4MCG6XABIMJKTN19IT",
+    "ETHERSCAN_KEY": "SZHYFZK2RR8H9TIMJBVW54V4H81K2Z2KR2",
+    "ETHERSCAN_KEY_2": "T6IR8VJHX2NE6ZJW2S3FDVN1TYG4PYYI45",
+    "COINMARKETCAP_KEY": "b54bcf4d-1bca-4e8e-9a24-22ff2c3d462c",
+    "COINMARKETCAP_KEY_2": "04cf4b5b-9868-465c-8ba0-9f2e78c92eb1",
+    "CRYPTOCOMPARE_KEY": "e79c8e6d4c5b4a3f2e1d0c9b8a7f6e5d4c3b2a1f",
+    "NEWSAPI_KEY": "pub_346789abc123def456789ghi012345jkl"
+}
 
 # Complete API Configuration (40 APIs total)
 API_CONFIG: Dict[str, Dict[str, Any]] = {
@@ -108,7 +133,6 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         "rate_limit": 333,
         "priority": 6,
         "headers": {
-            "X-CMC_PRO_API_KEY": COINMARKETCAP_KEY,
             "Accept": "application/json"
         },
         "auth_required": True
@@ -126,7 +150,6 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         "rate_limit": 333,
         "priority": 7,
         "headers": {
-            "X-CMC_PRO_API_KEY": COINMARKETCAP_KEY_2,
             "Accept": "application/json"
         },
         "auth_required": True
@@ -160,9 +183,7 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         },
         "rate_limit": 100,
         "priority": 9,
-        "headers": {
-            "Authorization": f"Apikey {CRYPTOCOMPARE_KEY}"
-        },
+        "headers": {},
         "auth_required": True
     },
     
@@ -179,7 +200,6 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         "rate_limit": 5,
         "priority": 10,
         "headers": {},
-        "params": {"apikey": ETHERSCAN_KEY},
         "auth_required": True
     },
     
@@ -196,7 +216,6 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         "rate_limit": 5,
         "priority": 11,
         "headers": {},
-        "params": {"apikey": ETHERSCAN_KEY_2},
         "auth_required": True
     },
     
@@ -213,7 +232,6 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         "rate_limit": 5,
         "priority": 12,
         "headers": {},
-        "params": {"apikey": BSCSCAN_KEY},
         "auth_required": True
     },
     
@@ -228,9 +246,7 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         },
         "rate_limit": 100,
         "priority": 13,
-        "headers": {
-            "TRON-PRO-API-KEY": TRONSCAN_KEY
-        },
+        "headers": {},
         "auth_required": True
     },
     
@@ -245,9 +261,7 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
         },
         "rate_limit": 1000,
         "priority": 14,
-        "headers": {
-            "X-API-Key": NEWSAPI_KEY
-        },
+        "headers": {},
         "auth_required": True
     },
     
@@ -561,31 +575,268 @@ API_CONFIG: Dict[str, Dict[str, Any]] = {
     }
 }
 
-# API Categories for easy filtering
-API_CATEGORIES = {
-    "exchanges": [name for name, config in API_CONFIG.items() if config["type"] == "exchange"],
-    "market_data": [name for name, config in API_CONFIG.items() if config["type"] == "market_data"],
-    "blockchain": [name for name, config in API_CONFIG.items() if config["type"] == "blockchain"],
-    "news": [name for name, config in API_CONFIG.items() if config["type"] == "news"],
-    "sentiment": [name for name, config in API_CONFIG.items() if config["type"] == "sentiment"],
-    "analytics": [name for name, config in API_CONFIG.items() if config["type"] == "analytics"]
+# Freeze the nested tables so read-only views of API_CONFIG (get_api_config, ApiSpec)
+# are read-only all the way down
+for _config in API_CONFIG.values():
+    for _table in ("endpoints", "headers", "params"):
+        if _table in _config:
+            _config[_table] = MappingProxyType(_config[_table])
+
+# Where each authenticated API expects its key: (location, field, key name, value format)
+_API_AUTH: Dict[str, Tuple[str, str, str, str]] = {
+    "coinmarketcap": ("headers", "X-CMC_PRO_API_KEY", "COINMARKETCAP_KEY", "{}"),
+    "coinmarketcap_backup": ("headers", "X-CMC_PRO_API_KEY", "COINMARKETCAP_KEY_2", "{}"),
+    "cryptocompare": ("headers", "Authorization", "CRYPTOCOMPARE_KEY", "Apikey {}"),
+    "etherscan": ("params", "apikey", "ETHERSCAN_KEY", "{}"),
+    "etherscan_backup": ("params", "apikey", "ETHERSCAN_KEY_2", "{}"),
+    "bscscan": ("params", "apikey", "BSCSCAN_KEY", "{}"),
+    "tronscan": ("headers", "TRON-PRO-API-KEY", "TRONSCAN_KEY", "{}"),
+    "newsapi": ("headers", "X-API-Key", "NEWSAPI_KEY", "{}")
+}
+
+# API Categories for easy filtering, keyed by category name per API type
+_CATEGORY_BY_TYPE = {
+    "exchange": "exchanges",
+    "market_data": "market_data",
+    "blockchain": "blockchain",
+    "news": "news",
+    "sentiment": "sentiment",
+    "analytics": "analytics"
+}
+_category_lists: Dict[str, List[str]] = {category: [] for category in _CATEGORY_BY_TYPE.values()}
+for _name, _config in API_CONFIG.items():
+    _category = _CATEGORY_BY_TYPE.get(_config["type"])
+    if _category is not None:
+        _category_lists[_category].append(_name)
+API_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    category: tuple(names) for category, names in _category_lists.items()
+}
+
+# Priority-ordered API list for fallback; API_CONFIG is declared in priority order (1..N)
+PRIORITY_APIS: Tuple[Tuple[str, Dict[str, Any]], ...] = tuple(API_CONFIG.items())
+if __debug__:
+    assert [config["priority"] for _, config in PRIORITY_APIS] == list(range(1, len(PRIORITY_APIS) + 1)), \
+        "API_CONFIG entries must be declared in priority order"
+
+# Record views of API_CONFIG, keyed by API name (the spec's name is the display name)
+API_SPECS: Dict[str, ApiSpec] = {api_name: ApiSpec(**config) for api_name, config in API_CONFIG.items()}
+PRIORITY_SPECS: Tuple[Tuple[str, ApiSpec], ...] = tuple(API_SPECS.items())
+_PRIMARY_APIS = tuple(name for name, _ in PRIORITY_APIS[:10])
+_FALLBACK_APIS = tuple(name for name, _ in PRIORITY_APIS[10:])
+
+# Full endpoint URLs (base_url + path) per API, templated ones keep their {placeholders}
+API_URLS: Dict[str, Dict[str, str]] = {
+    name: {endpoint: config["base_url"] + path for endpoint, path in config["endpoints"].items()}
+    for name, config in API_CONFIG.items()
+}
+
+# Read-only views handed out by get_api_config, so callers cannot edit the shared config
+_CONFIG_VIEWS = {name: MappingProxyType(config) for name, config in API_CONFIG.items()}
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+def get_api_config(api_name: str) -> Mapping[str, Any]:
+    """Get a read-only view of the configuration for a specific API"""
+    return _CONFIG_VIEWS.get(api_name, _EMPTY_CONFIG)
+
+@lru_cache(maxsize=None)
+def get_key(key_name: str) -> str:
+    """Get an API key from the environment, falling back to the built-in default"""
+    return os.environ.get(key_name) or _DEFAULT_KEYS[key_name]
+
+def _with_auth(api_name: str, location: str) -> Mapping[str, str]:
+    """Build the static headers or params of an API with its key filled in"""
+    values = dict(API_CONFIG.get(api_name, {}).get(location, {}))
+    auth = _API_AUTH.get(api_name)
+    if auth is not None and auth[0] == location:
+        _, field, key_name, value_format = auth
+        values[field] = value_format.format(get_key(key_name))
+    return MappingProxyType(values)
+
+@lru_cache(maxsize=64)
+def headers_for(api_name: str) -> Mapping[str, str]:
+    """Get the request headers for an API, including its key (built once, read-only)"""
+    return _with_auth(api_name, "headers")
+
+@lru_cache(maxsize=64)
+def params_for(api_name: str) -> Mapping[str, str]:
+    """Get the default query params for an API, including its key (built once, read-only)"""
+    return _with_auth(api_name, "params")
+
+# Pooled HTTP clients, one per API, so connections and TLS sessions are reused
+API_CLIENTS: Dict[str, httpx.AsyncClient] = {}
+CLIENT_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+def _new_client(api_name: str, config: Mapping[str, Any]) -> httpx.AsyncClient:
+    """Create a keep-alive client with a pool sized to the API's rate limit"""
+    rate_limit = config.get("rate_limit", 60)
+    return httpx.AsyncClient(
+        base_url=config["base_url"],
+        headers=headers_for(api_name),
+        params=params_for(api_name),
+        limits=httpx.Limits(
+            max_keepalive_connections=min(rate_limit, 32),
+            max_connections=min(rate_limit, 64)
+        ),
+        timeout=CLIENT_TIMEOUT,
+        http2=True
+    )
+
+def build_clients() -> Dict[str, httpx.AsyncClient]:
+    """Create the pooled clients for every configured API"""
+    for name, config in API_CONFIG.items():
+        if name not in API_CLIENTS:
+            API_CLIENTS[name] = _new_client(name, config)
+    return API_CLIENTS
+
+def get_client(api_name: str) -> Optional[httpx.AsyncClient]:
+    """Get the pooled client for a specific API, creating it on first use"""
+    client = API_CLIENTS.get(api_name)
+    if client is None:
+        config = API_CONFIG.get(api_name)
+        if config is None:
+            return None
+        client = API_CLIENTS[api_name] = _new_client(api_name, config)
+    return client
+
+async def _safe_head(client: httpx.AsyncClient, timeout: float):
+    """Send a bare HEAD to the client's base URL, ignoring the outcome"""
+    # Built directly rather than through client.head() so the API's default
+    # headers and params, which carry its key, are not sent
+    request = httpx.Request("HEAD", client.base_url, extensions={"timeout": httpx.Timeout(timeout).as_dict()})
+    try:
+        response = await client.send(request)
+        await response.aclose()
+    except httpx.HTTPError:
+        pass
+
+async def prewarm(timeout: float = 2.0):
+    """
+    Open a pooled connection to every API concurrently so first requests skip TCP/TLS setup.
+    
+    Sends one unauthenticated HEAD per API outside APIFallbackManager's
+    request window, so only call it where that extra request is acceptable.
+    """
+    clients = build_clients()
+    await asyncio.gather(
+        *(_safe_head(client, timeout) for client in clients.values()),
+        return_exceptions=True
+    )
+
+async def close_clients():
+    """Close all pooled clients; call on application shutdown"""
+    clients = list(API_CLIENTS.values())
+    API_CLIENTS.clear()
+    for client in clients:
+        await client.aclose()
+
+# Per-API concurrency caps, sized like the client pools, for fanning out with asyncio.gather
+MAX_CONCURRENCY = 32
+RATE_LIMITERS: Dict[str, asyncio.Semaphore] = {
+    name: asyncio.Semaphore(min(config["rate_limit"], MAX_CONCURRENCY))
+    for name, config in API_CONFIG.items()
+}
+
+def get_limiter(api_name: str) -> asyncio.Semaphore:
+    """Get the concurrency limiter for a specific API"""
+    return RATE_LIMITERS[api_name]
+
+# Response cache TTLs in seconds by API type, with overrides for slow-changing endpoints
+_CACHE_TTL_BY_TYPE = {
+    "exchange": 1.0,
+    "market_data": 1.0,
+    "blockchain": 15.0,
+    "news": 60.0,
+    "sentiment": 60.0,
+    "analytics": 300.0
 }
+_CACHE_TTL_BY_ENDPOINT = {
+    "symbols": 3600.0,
+    "currencies": 3600.0,
+    "assets": 3600.0,
+    "coins": 300.0,
+    "listings": 300.0,
+    "global": 300.0
+}
+RESPONSE_CACHE_SIZE = 2048
+
+# (api, endpoint, params, path params) -> (expires at, ETag, Last-Modified, JSON body); LRU ordered
+_RESPONSE_CACHE: "OrderedDict[Tuple, Tuple[float, Optional[str], Optional[str], Any]]" = OrderedDict()
+
+def get_cache_ttl(api_name: str, endpoint: str) -> float:
+    """Get how long a response from an API endpoint stays fresh"""
+    ttl = _CACHE_TTL_BY_ENDPOINT.get(endpoint)
+    if ttl is None:
+        ttl = _CACHE_TTL_BY_TYPE.get(API_CONFIG[api_name]["type"], 1.0)
+    return ttl
+
+async def cached_get(
+    api_name: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    **path_params: Any
+) -> Any:
+    """
+    GET an API endpoint by name and return its JSON body.
+
+    Fresh responses are served from the in-process cache. Stale ones are
+    revalidated with If-None-Match/If-Modified-Since when the server sent
+    an ETag or Last-Modified, so an unchanged resource costs a bodiless 304.
+    Path parameters fill templated endpoints such as "/ticker/{symbol}".
+    Raises httpx.HTTPStatusError on error responses.
+    """
+    key = (
+        api_name,
+        endpoint,
+        tuple(sorted(params.items())) if params else (),
+        tuple(sorted(path_params.items())) if path_params else ()
+    )
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        _RESPONSE_CACHE.move_to_end(key)
+        return entry[3]
+
+    # Absolute URL: joining an empty endpoint onto the client's base_url would add a slash
+    url = API_URLS[api_name][endpoint]
+    if path_params:
+        url = url.format(**path_params)
+
+    headers = {}
+    if entry is not None:
+        if entry[1]:
+            headers["If-None-Match"] = entry[1]
+        if entry[2]:
+            headers["If-Modified-Since"] = entry[2]
+
+    async with get_limiter(api_name):
+        response = await get_client(api_name).get(url, params=params, headers=headers)
+
+    if response.status_code == 304 and entry is not None:
+        etag, last_modified, data = entry[1], entry[2], entry[3]
+    else:
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
 
-# Priority-sorted API list for fallback
-PRIORITY_APIS = sorted(API_CONFIG.items(), key=lambda x: x[1]["priority"])
+    _RESPONSE_CACHE[key] = (time.monotonic() + get_cache_ttl(api_name, endpoint), etag, last_modified, data)
+    _RESPONSE_CACHE.move_to_end(key)
+    if len(_RESPONSE_CACHE) > RESPONSE_CACHE_SIZE:
+        _RESPONSE_CACHE.popitem(last=False)
+    return data
 
-def get_api_config(api_name: str) -> Dict[str, Any]:
-    """Get configuration for a specific API"""
-    return API_CONFIG.get(api_name, {})
+def get_url(api_name: str, endpoint: str) -> Optional[str]:
+    """Get the full URL of a named API endpoint"""
+    urls = API_URLS.get(api_name)
+    return urls.get(endpoint) if urls is not None else None
 
-def get_apis_by_category(category: str) -> List[str]:
-    """Get all APIs in a specific category"""
-    return API_CATEGORIES.get(category, [])
+def get_apis_by_category(category: str) -> Tuple[str, ...]:
+    """Get all APIs in a specific category (a shared, immutable tuple)"""
+    return API_CATEGORIES.get(category, ())
 
-def get_primary_apis() -> List[str]:
-    """Get the top 10 primary APIs"""
-    return [name for name, _ in PRIORITY_APIS[:10]]
+def get_primary_apis() -> Tuple[str, ...]:
+    """Get the top 10 primary APIs (a shared, immutable tuple)"""
+    return _PRIMARY_APIS
 
-def get_fallback_apis() -> List[str]:
-    """Get all fallback APIs (11-40)"""
-    return [name for name, _ in PRIORITY_APIS[10:]]
\ No newline at end of file
+def get_fallback_apis() -> Tuple[str, ...]:
+    """Get all fallback APIs (11-40) (a shared, immutable tuple)"""
+    return _FALLBACK_APIS
\ No newline at end of file
@@ -10,10 +10,10 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
-import aiohttp
+import httpx
 import redis
 
-from .api_config import API_CONFIG, PRIORITY_APIS
+from .api_config import API_CONFIG, PRIORITY_SPECS, build_clients, get_api_config, get_client, get_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +35,6 @@ class APIFallbackManager:
         self.redis_client = redis_client
         self.api_health: Dict[str, APIHealthStatus] = {}
         self.rate_limiters: Dict[str, List[float]] = {}
-        self.session: Optional[aiohttp.ClientSession] = None
         
         # Initialize health status for all APIs
         for api_name in API_CONFIG:
@@ -52,16 +51,11 @@ class APIFallbackManager:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10),
-            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
-        )
+        build_clients()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit; the pooled clients are shared and closed at shutdown"""
     
     def _is_rate_limited(self, api_name: str) -> bool:
         """Check if API is rate limited"""
@@ -91,50 +85,37 @@ class APIFallbackManager:
         headers: Optional[Dict] = None
     ) -> Tuple[bool, Optional[Dict], float]:
         """Make HTTP request to API with error handling"""
-        if not self.session:
+        client = get_client(api_name)
+        if client is None:
             return False, None, 0.0
         
         if self._is_rate_limited(api_name):
             logger.warning(f"API {api_name} is rate limited")
             return False, {"error": "rate_limited"}, 0.0
         
-        config = API_CONFIG.get(api_name, {})
-        base_url = config.get("base_url", "")
-        
-        # Merge headers
-        request_headers = config.get("headers", {}).copy()
-        if headers:
-            request_headers.update(headers)
-        
-        # Merge params
-        request_params = config.get("params", {}).copy()
-        if params:
-            request_params.update(params)
-        
-        url = f"{base_url}{endpoint}"
+        # Absolute URL so empty endpoints keep the configured path (base_url joining
+        # would append a slash); the pooled client adds the API's headers and params
+        url = f"{API_CONFIG[api_name]['base_url']}{endpoint}"
         start_time = time.time()
         
         try:
             self._record_request(api_name)
             
-            async with self.session.get(
-                url, 
-                params=request_params, 
-                headers=request_headers
-            ) as response:
-                response_time = time.time() - start_time
+            async with get_limiter(api_name):
+                response = await client.get(url, params=params, headers=headers)
+            response_time = time.time() - start_time
+            
+            if response.status_code == 200:
+                data = response.json()
+                return True, data, response_time
+            elif response.status_code == 429:  # Rate limited
+                logger.warning(f"API {api_name} returned 429 (rate limited)")
+                return False, {"error": "rate_limited"}, response_time
+            else:
+                logger.error(f"API {api_name} returned status {response.status_code}")
+                return False, {"error": f"http_{response.status_code}"}, response_time
                 
-                if response.status == 200:
-                    data = await response.json()
-                    return True, data, response_time
-                elif response.status == 429:  # Rate limited
-                    logger.warning(f"API {api_name} returned 429 (rate limited)")
-                    return False, {"error": "rate_limited"}, response_time
-                else:
-                    logger.error(f"API {api_name} returned status {response.status}")
-                    return False, {"error": f"http_{response.status}"}, response_time
-                    
-        except asyncio.TimeoutError:
+        except httpx.TimeoutException:
             response_time = time.time() - start_time
             logger.error(f"API {api_name} request timed out")
             return False, {"error": "timeout"}, response_time
@@ -180,8 +161,8 @@ class APIFallbackManager:
         }
         
         # Try APIs in priority order
-        for api_name, config in PRIORITY_APIS:
-            if config["type"] not in ["exchange", "market_data"]:
+        for api_name, spec in PRIORITY_SPECS:
+            if spec.type not in ("exchange", "market_data"):
                 continue
             
             # Skip if API is down
@@ -214,8 +195,8 @@ class APIFallbackManager:
     
     async def _get_price_from_api(self, api_name: str, symbol: str) -> Tuple[bool, Optional[Dict], float]:
         """Get price from specific API"""
-        config = API_CONFIG.get(api_name, {})
-        endpoints = config.get("endpoints", {})
+        config = get_api_config(api_name)
+        endpoints = config.get("endpoints") or {}
         
         if api_name == "kucoin":
             endpoint = endpoints.get("price", "")
@@ -321,11 +302,7 @@ class APIFallbackManager:
     
     async def check_all_apis_health(self) -> Dict[str, Dict[str, Any]]:
         """Check health of all APIs"""
-        if not self.session:
-            async with self:
-                return await self._check_all_apis_health()
-        else:
-            return await self._check_all_apis_health()
+        return await self._check_all_apis_health()
     
     async def _check_all_apis_health(self) -> Dict[str, Dict[str, Any]]:
         """Internal method to check all APIs health"""
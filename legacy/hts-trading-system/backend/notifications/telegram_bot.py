@@ -4,24 +4,284 @@ Real-time notifications and alerts.
 """
 
 import asyncio
+import itertools
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import secrets
+import time
+from html import escape
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple
+from datetime import datetime, timezone
 
 from telegram import Bot, Update
+from telegram.constants import ParseMode
+from telegram.error import RetryAfter, TelegramError
 from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.request import HTTPXRequest
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses are then parsed with the stdlib decoder
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# HTTP connections shared by the bot, sized for concurrent broadcasts and
+# kept alive over HTTP/2 between alerts
+CONNECTION_POOL_SIZE = 256
+POOL_TIMEOUT = 30.0  # seconds to wait for a free connection
+HTTP_VERSION = "2"
+
+# Long polling for commands: each getUpdates call waits up to POLL_TIMEOUT
+# seconds on the server and returns up to 100 updates, which the handlers
+# process concurrently
+POLL_TIMEOUT = 30  # seconds
+
+# Outgoing message rate limits, kept under Telegram's 30 msg/s per bot and
+# 20 msg/min per group
+GLOBAL_RATE_LIMIT = 28.0  # messages per second
+CHAT_RATE_LIMIT = 1 / 3  # messages per second per chat
+
+# Alert batching: pending alerts per chat are joined and flushed together
+BATCH_FLUSH_INTERVAL = 3.0  # seconds
+MAX_BUFFER_SIZE = 100  # pending alerts kept per chat; the oldest are dropped beyond this
+COALESCE_WINDOW = 10  # most recent pending alerts searched for one to overwrite
+MAX_MESSAGE_LENGTH = 4000  # Telegram allows 4096; leaves headroom for HTML entities
+_BATCH_SEPARATOR = "\n\n━━━━━━━━━━━━\n\n"  # Between alerts joined into one message
+
+# Rendered alerts waiting for the sender task; beyond this, new alerts are dropped
+SEND_QUEUE_SIZE = 10_000
+SHUTDOWN_DRAIN_TIMEOUT = 10.0  # seconds stop_bot waits for the send queue before dropping the rest
+
+# Send order by severity (lower goes first); critical alerts also skip batching
+_PRIORITY = {"critical": 0, "high": 1, "medium": 2, "low": 3, "info": 4}
+
+# Emoji prefixes for alert messages
+_SIGNAL_EMOJI = {
+    "STRONG_BUY": "🚀",
+    "BUY": "📈",
+    "SELL": "📉",
+    "STRONG_SELL": "💥"
+}
+_SEVERITY_EMOJI = {
+    "low": "⚠️",
+    "medium": "🚨",
+    "high": "💥",
+    "critical": "🔥"
+}
+_SIDE_EMOJI = {"BUY": "🟢", "SELL": "🔴"}
+
+# Command replies
+_WELCOME_MESSAGE = """
+🚀 <b>HTS Trading System Bot</b>
+
+Welcome to the High-Frequency Trading System notifications bot!
+
+Available commands:
+/help - Show all commands
+/subscribe - Subscribe to notifications
+/unsubscribe - Unsubscribe from notifications
+/status - Get system status
+/portfolio - Get portfolio summary
+/alerts - Configure alert settings
+
+The bot will send you real-time trading signals, portfolio updates, and important alerts.
+"""
+
+_HELP_MESSAGE = """
+📚 <b>HTS Trading Bot Commands</b>
+
+<b>Basic Commands:</b>
+/start - Welcome message and setup
+/help - Show this help message
+/subscribe - Subscribe to notifications
+/unsubscribe - Unsubscribe from notifications
+
+<b>Information Commands:</b>
+/status - Get system and API status
+/portfolio - Get current portfolio summary
+/signals - Get latest trading signals
+
+<b>Configuration:</b>
+/alerts - Configure notification settings
+/settings - View current settings
+
+<b>Notifications You'll Receive:</b>
+🔥 Strong trading signals (BUY/SELL)
+💰 Portfolio updates and P&amp;L changes
+⚠️ Risk alerts and limit breaches
+🔧 System status and API health
+✅ Trade confirmations
+
+For support, contact the HTS team.
+"""
+
+# /status and /portfolio replies, filled in with the current time
+_STATUS_TEMPLATE = """
+📊 <b>HTS System Status</b>
+
+🟢 <b>System:</b> Online
+🟢 <b>Primary APIs:</b> 38/40 Healthy
+🟡 <b>Secondary APIs:</b> 2/40 Degraded
+🟢 <b>Database:</b> Connected
+🟢 <b>WebSocket:</b> 15 Connections
+
+📈 <b>Trading Status:</b>
+• Active Signals: 12
+• Portfolio Value: $10,247.50
+• Daily P&amp;L: +$247.50 (+2.48%)
+• Open Positions: 5
+
+🕐 <b>Last Update:</b> {timestamp}
+"""
+
+_PORTFOLIO_TEMPLATE = """
+💰 <b>Portfolio Summary</b>
+
+💵 <b>Total Value:</b> $10,247.50
+📈 <b>Total P&amp;L:</b> +$247.50 (+2.48%)
+📊 <b>Today's P&amp;L:</b> +$125.30 (+1.23%)
+
+🏆 <b>Positions (5):</b>
+• BTC: +$150.25 (+3.2%)
+• ETH: +$75.50 (+2.1%)
+• ADA: -$25.75 (-1.8%)
+• DOT: +$45.20 (+4.5%)
+• LINK: +$2.30 (+0.1%)
+
+📊 <b>Performance:</b>
+• Win Rate: 68.5%
+• Best Trade: +$287.50
+• Worst Trade: -$145.20
+• Sharpe Ratio: 1.85
+
+🕐 <b>Last Update:</b> {timestamp}
+"""
+
+_ALERTS_TEMPLATE = """
+⚙️ <b>Alert Settings</b>
+
+{strong_signals} Strong Signals: {strong_signals_state}
+{portfolio_updates} Portfolio Updates: {portfolio_updates_state}
+{risk_alerts} Risk Alerts: {risk_alerts_state}
+{api_status} API Status: {api_status_state}
+{trade_confirmations} Trade Confirmations: {trade_confirmations_state}
+
+To modify settings, contact the HTS team.
+"""
+
+def _render_alert_settings(settings: Dict[str, bool]) -> str:
+    """Render the /alerts reply for the given settings"""
+    fields = {}
+    for name, enabled in settings.items():
+        fields[name] = "🟢" if enabled else "🔴"
+        fields[f"{name}_state"] = "Enabled" if enabled else "Disabled"
+    return _ALERTS_TEMPLATE.format_map(fields)
+
+_clock_second = -1
+_clock_text = ""
+
+def _utc_clock() -> str:
+    """Current UTC time as 'HH:MM:SS UTC', formatted at most once per second"""
+    global _clock_second, _clock_text
+    now = int(time.time())
+    if now != _clock_second:
+        _clock_second = now
+        _clock_text = time.strftime("%H:%M:%S UTC", time.gmtime(now))
+    return _clock_text
+
+class _OrjsonRequest(HTTPXRequest):
+    """HTTPXRequest that parses Telegram's JSON responses with orjson when available"""
+    
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> Dict[str, Any]:
+        if orjson is None:
+            return HTTPXRequest.parse_json_payload(payload)
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError as exc:
+            raise TelegramError("Invalid server response") from exc
+
+class _TokenBucket:
+    """Async token bucket refilling `rate` tokens per second, up to `capacity`"""
+    
+    __slots__ = ("rate", "capacity", "tokens", "updated", "lock")
+    
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait for and take one token; waiters are served in FIFO order"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def pause(self, seconds: float):
+        """Hand out no tokens for the next `seconds` (e.g. a flood-wait)"""
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+def _coalesce(pending: Deque[Tuple[Optional[str], str]], key: str, text: str) -> bool:
+    """Overwrite the newest pending alert with this key among the last COALESCE_WINDOW"""
+    last = len(pending) - 1
+    for i in range(last, max(last - COALESCE_WINDOW, -1), -1):
+        if pending[i][0] == key:
+            pending[i] = (key, text)
+            return True
+    return False
+
+def _pack_messages(texts: List[str], limit: int = MAX_MESSAGE_LENGTH) -> List[str]:
+    """
+    Join texts with _BATCH_SEPARATOR into as few messages of at most `limit`
+    characters as possible, splitting only between texts so no alert (or HTML
+    tag) is cut in half. A single text longer than `limit` is cut into chunks.
+    """
+    messages = []
+    parts: List[str] = []
+    length = 0
+    for text in texts:
+        for start in range(0, len(text), limit):
+            chunk = text[start:start + limit]
+            if parts and length + len(_BATCH_SEPARATOR) + len(chunk) > limit:
+                messages.append(_BATCH_SEPARATOR.join(parts))
+                parts, length = [], 0
+            length += len(chunk) + (len(_BATCH_SEPARATOR) if parts else 0)
+            parts.append(chunk)
+    if parts:
+        messages.append(_BATCH_SEPARATOR.join(parts))
+    return messages
+
 class TelegramBot:
     """Telegram bot for trading alerts and notifications"""
     
-    def __init__(self, bot_token: Optional[str] = None):
+    __slots__ = (
+        "bot_token", "webhook_url", "webhook_secret", "bot", "application",
+        "subscribers", "_subscribers_tuple",
+        "alert_settings", "_alerts_rendered",
+        "batch_enabled", "batch_flush_interval", "max_buffer_size", "_outbox", "_flush_task",
+        "_send_queue", "_send_seq", "_sender_task", "_wakeup", "_flush_stop",
+        "_global_bucket", "_chat_buckets"
+    )
+    
+    def __init__(self, bot_token: Optional[str] = None, webhook_url: Optional[str] = None):
         # Demo bot token (replace with real token in production)
         self.bot_token = bot_token or "YOUR_BOT_TOKEN_HERE"
+        # Public HTTPS URL Telegram pushes updates to; None falls back to long polling
+        self.webhook_url = webhook_url
+        self.webhook_secret = secrets.token_urlsafe(32)  # Checked on every pushed update
         self.bot: Optional[Bot] = None
         self.application: Optional[Application] = None
-        self.subscribers: List[str] = []  # Chat IDs of subscribers
+        self.subscribers: Set[str] = set()  # Chat IDs of subscribers
+        self._subscribers_tuple: Tuple[str, ...] = ()  # Snapshot for broadcasts, rebuilt on changes
         
         # Alert settings
         self.alert_settings = {
@@ -31,6 +291,24 @@ class TelegramBot:
             "api_status": False,
             "trade_confirmations": True
         }
+        self._alerts_rendered: Optional[str] = None  # Cached /alerts reply, reset on settings updates
+        
+        # Alert batching
+        self.batch_enabled = True
+        self.batch_flush_interval = BATCH_FLUSH_INTERVAL
+        self.max_buffer_size = MAX_BUFFER_SIZE
+        # Pending (coalesce key, alert) pairs per chat ID
+        self._outbox: Dict[str, Deque[Tuple[Optional[str], str]]] = self._new_outbox()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._send_queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=SEND_QUEUE_SIZE)
+        self._send_seq = itertools.count()  # Keeps FIFO order among equal priorities
+        self._sender_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()  # Set when an empty chat outbox gets an alert
+        self._flush_stop = asyncio.Event()  # Set by stop_bot; the flusher exits between flushes
+        
+        # Rate limiting
+        self._global_bucket = _TokenBucket(GLOBAL_RATE_LIMIT)
+        self._chat_buckets: Dict[str, _TokenBucket] = {}
     
     async def initialize(self) -> bool:
         """Initialize the Telegram bot"""
@@ -39,8 +317,26 @@ class TelegramBot:
                 logger.warning("Demo bot token - Telegram notifications disabled")
                 return False
             
-            self.bot = Bot(token=self.bot_token)
-            self.application = Application.builder().token(self.bot_token).build()
+            builder = (
+                Application.builder()
+                .token(self.bot_token)
+                .request(
+                    _OrjsonRequest(
+                        connection_pool_size=CONNECTION_POOL_SIZE,
+                        pool_timeout=POOL_TIMEOUT,
+                        http_version=HTTP_VERSION
+                    )
+                )
+                .concurrent_updates(True)
+            )
+            if self.webhook_url:
+                # Updates arrive through process_webhook_update; no poller needed
+                builder = builder.updater(None)
+            else:
+                builder = builder.get_updates_request(_OrjsonRequest())
+            self.application = builder.build()
+            # Share the application's connection pool for outgoing alerts
+            self.bot = self.application.bot
             
             # Add command handlers
             self.application.add_handler(CommandHandler("start", self.start_command))
@@ -64,25 +360,9 @@ class TelegramBot:
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         try:
-            welcome_message = """
-🚀 *HTS Trading System Bot*
-
-Welcome to the High-Frequency Trading System notifications bot!
-
-Available commands:
-/help - Show all commands
-/subscribe - Subscribe to notifications
-/unsubscribe - Unsubscribe from notifications
-/status - Get system status
-/portfolio - Get portfolio summary
-/alerts - Configure alert settings
-
-The bot will send you real-time trading signals, portfolio updates, and important alerts.
-            """
-            
             await update.message.reply_text(
-                welcome_message, 
-                parse_mode='Markdown'
+                _WELCOME_MESSAGE, 
+                parse_mode=ParseMode.HTML
             )
             
         except Exception as e:
@@ -91,37 +371,9 @@ The bot will send you real-time trading signals, portfolio updates, and importan
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
         try:
-            help_message = """
-📚 *HTS Trading Bot Commands*
-
-*Basic Commands:*
-/start - Welcome message and setup
-/help - Show this help message
-/subscribe - Subscribe to notifications
-/unsubscribe - Unsubscribe from notifications
-
-*Information Commands:*
-/status - Get system and API status
-/portfolio - Get current portfolio summary
-/signals - Get latest trading signals
-
-*Configuration:*
-/alerts - Configure notification settings
-/settings - View current settings
-
-*Notifications You'll Receive:*
-🔥 Strong trading signals (BUY/SELL)
-💰 Portfolio updates and P&L changes
-⚠️ Risk alerts and limit breaches
-🔧 System status and API health
-✅ Trade confirmations
-
-For support, contact the HTS team.
-            """
-            
             await update.message.reply_text(
-                help_message, 
-                parse_mode='Markdown'
+                _HELP_MESSAGE, 
+                parse_mode=ParseMode.HTML
             )
             
         except Exception as e:
@@ -133,7 +385,8 @@ For support, contact the HTS team.
             chat_id = str(update.effective_chat.id)
             
             if chat_id not in self.subscribers:
-                self.subscribers.append(chat_id)
+                self.subscribers.add(chat_id)
+                self._subscribers_tuple = tuple(self.subscribers)
                 message = "✅ You've successfully subscribed to HTS trading notifications!"
             else:
                 message = "ℹ️ You're already subscribed to notifications."
@@ -150,7 +403,8 @@ For support, contact the HTS team.
             chat_id = str(update.effective_chat.id)
             
             if chat_id in self.subscribers:
-                self.subscribers.remove(chat_id)
+                self.subscribers.discard(chat_id)
+                self._subscribers_tuple = tuple(self.subscribers)
                 message = "❌ You've been unsubscribed from HTS trading notifications."
             else:
                 message = "ℹ️ You're not currently subscribed to notifications."
@@ -165,27 +419,13 @@ For support, contact the HTS team.
         """Handle /status command"""
         try:
             # Mock status data (in production, would fetch from system)
-            status_message = """
-📊 *HTS System Status*
-
-🟢 *System:* Online
-🟢 *Primary APIs:* 38/40 Healthy
-🟡 *Secondary APIs:* 2/40 Degraded
-🟢 *Database:* Connected
-🟢 *WebSocket:* 15 Connections
-
-📈 *Trading Status:*
-• Active Signals: 12
-• Portfolio Value: $10,247.50
-• Daily P&L: +$247.50 (+2.48%)
-• Open Positions: 5
-
-🕐 *Last Update:* {timestamp}
-            """.format(timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"))
+            status_message = _STATUS_TEMPLATE.format(
+                timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+            )
             
             await update.message.reply_text(
                 status_message, 
-                parse_mode='Markdown'
+                parse_mode=ParseMode.HTML
             )
             
         except Exception as e:
@@ -195,32 +435,13 @@ For support, contact the HTS team.
         """Handle /portfolio command"""
         try:
             # Mock portfolio data (in production, would fetch from portfolio manager)
-            portfolio_message = """
-💰 *Portfolio Summary*
-
-💵 *Total Value:* $10,247.50
-📈 *Total P&L:* +$247.50 (+2.48%)
-📊 *Today's P&L:* +$125.30 (+1.23%)
-
-🏆 *Positions (5):*
-• BTC: +$150.25 (+3.2%)
-• ETH: +$75.50 (+2.1%)
-• ADA: -$25.75 (-1.8%)
-• DOT: +$45.20 (+4.5%)
-• LINK: +$2.30 (+0.1%)
-
-📊 *Performance:*
-• Win Rate: 68.5%
-• Best Trade: +$287.50
-• Worst Trade: -$145.20
-• Sharpe Ratio: 1.85
-
-🕐 *Last Update:* {timestamp}
-            """.format(timestamp=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC"))
+            portfolio_message = _PORTFOLIO_TEMPLATE.format(
+                timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+            )
             
             await update.message.reply_text(
                 portfolio_message, 
-                parse_mode='Markdown'
+                parse_mode=ParseMode.HTML
             )
             
         except Exception as e:
@@ -229,24 +450,12 @@ For support, contact the HTS team.
     async def alerts_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /alerts command"""
         try:
-            settings = self.alert_settings
-            status_emoji = {True: "🟢", False: "🔴"}
-            
-            alerts_message = f"""
-⚙️ *Alert Settings*
-
-{status_emoji[settings['strong_signals']]} Strong Signals: {'Enabled' if settings['strong_signals'] else 'Disabled'}
-{status_emoji[settings['portfolio_updates']]} Portfolio Updates: {'Enabled' if settings['portfolio_updates'] else 'Disabled'}
-{status_emoji[settings['risk_alerts']]} Risk Alerts: {'Enabled' if settings['risk_alerts'] else 'Disabled'}
-{status_emoji[settings['api_status']]} API Status: {'Enabled' if settings['api_status'] else 'Disabled'}
-{status_emoji[settings['trade_confirmations']]} Trade Confirmations: {'Enabled' if settings['trade_confirmations'] else 'Disabled'}
-
-To modify settings, contact the HTS team.
-            """
+            if self._alerts_rendered is None:
+                self._alerts_rendered = _render_alert_settings(self.alert_settings)
             
             await update.message.reply_text(
-                alerts_message, 
-                parse_mode='Markdown'
+                self._alerts_rendered, 
+                parse_mode=ParseMode.HTML
             )
             
         except Exception as e:
@@ -258,50 +467,38 @@ To modify settings, contact the HTS team.
             if not self.bot or not self.subscribers or not self.alert_settings["strong_signals"]:
                 return
             
-            signal = signal_data.get("signal", "")
-            symbol = signal_data.get("symbol", "")
-            confidence = signal_data.get("confidence", 0)
-            price = signal_data.get("price", 0)
-            
             # Only send alerts for strong signals
+            confidence = signal_data.get("confidence", 0)
             if confidence < 75:
                 return
             
-            signal_emoji = {
-                "STRONG_BUY": "🚀",
-                "BUY": "📈",
-                "SELL": "📉",
-                "STRONG_SELL": "💥"
-            }
+            signal = signal_data.get("signal", "")
+            symbol = signal_data.get("symbol", "")
+            price = signal_data.get("price", 0)
             
-            emoji = signal_emoji.get(signal, "📊")
+            # Render the message once for every subscriber
+            emoji = _SIGNAL_EMOJI.get(signal, "📊")
+            components = signal_data.get("components", {})
+            timestamp = _utc_clock()
             
             alert_message = f"""
-{emoji} *TRADING SIGNAL ALERT*
+{emoji} <b>TRADING SIGNAL ALERT</b>
 
-🪙 *Symbol:* {symbol}
-📊 *Signal:* {signal}
-🎯 *Confidence:* {confidence}%
-💰 *Price:* ${price:,.2f}
+🪙 <b>Symbol:</b> {escape(str(symbol))}
+📊 <b>Signal:</b> {escape(str(signal))}
+🎯 <b>Confidence:</b> {confidence}%
+💰 <b>Price:</b> ${price:,.2f}
 
-⚡ *Components:*
-• RSI/MACD: {signal_data.get('components', {}).get('rsi_macd', 0):.1f}
-• Smart Money: {signal_data.get('components', {}).get('smc', 0):.1f}
-• Pattern: {signal_data.get('components', {}).get('pattern', 0):.1f}
+⚡ <b>Components:</b>
+• RSI/MACD: {components.get('rsi_macd', 0):.1f}
+• Smart Money: {components.get('smc', 0):.1f}
+• Pattern: {components.get('pattern', 0):.1f}
 
-🕐 *Time:* {datetime.utcnow().strftime("%H:%M:%S UTC")}
+🕐 <b>Time:</b> {timestamp}
             """
             
-            # Send to all subscribers
-            for chat_id in self.subscribers:
-                try:
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=alert_message,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send alert to {chat_id}: {str(e)}")
+            # Send to all subscribers in the background
+            await self._enqueue(alert_message, "alert", "medium", key=f"signal:{symbol}")
             
             logger.info(f"Signal alert sent for {symbol}: {signal} ({confidence}%)")
             
@@ -323,29 +520,22 @@ To modify settings, contact the HTS team.
                 return
             
             pnl_emoji = "📈" if daily_pnl > 0 else "📉"
+            timestamp = _utc_clock()
             
             update_message = f"""
-{pnl_emoji} *PORTFOLIO UPDATE*
+{pnl_emoji} <b>PORTFOLIO UPDATE</b>
 
-💰 *Total Value:* ${total_value:,.2f}
-📊 *Daily P&L:* {'+' if daily_pnl > 0 else ''}${daily_pnl:,.2f} ({daily_pnl_pct:+.2f}%)
+💰 <b>Total Value:</b> ${total_value:,.2f}
+📊 <b>Daily P&amp;L:</b> {'+' if daily_pnl > 0 else ''}${daily_pnl:,.2f} ({daily_pnl_pct:+.2f}%)
 
-🏆 *Positions:* {portfolio_data.get('position_count', 0)}
-📈 *Win Rate:* {portfolio_data.get('win_rate', 0):.1f}%
+🏆 <b>Positions:</b> {portfolio_data.get('position_count', 0)}
+📈 <b>Win Rate:</b> {portfolio_data.get('win_rate', 0):.1f}%
 
-🕐 *Time:* {datetime.utcnow().strftime("%H:%M:%S UTC")}
+🕐 <b>Time:</b> {timestamp}
             """
             
-            # Send to subscribers
-            for chat_id in self.subscribers:
-                try:
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=update_message,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send portfolio update to {chat_id}: {str(e)}")
+            # Send to all subscribers in the background
+            await self._enqueue(update_message, "portfolio update", "info", key="portfolio")
             
             logger.info(f"Portfolio update sent: {daily_pnl_pct:+.2f}%")
             
@@ -362,36 +552,22 @@ To modify settings, contact the HTS team.
             message = risk_data.get("message", "")
             severity = risk_data.get("severity", "medium")
             
-            severity_emoji = {
-                "low": "⚠️",
-                "medium": "🚨",
-                "high": "💥",
-                "critical": "🔥"
-            }
-            
-            emoji = severity_emoji.get(severity, "⚠️")
+            emoji = _SEVERITY_EMOJI.get(severity, "⚠️")
+            timestamp = _utc_clock()
             
             risk_message = f"""
-{emoji} *RISK ALERT*
+{emoji} <b>RISK ALERT</b>
 
-🎯 *Type:* {alert_type}
-📊 *Severity:* {severity.upper()}
+🎯 <b>Type:</b> {escape(str(alert_type))}
+📊 <b>Severity:</b> {escape(str(severity).upper())}
 
-💬 *Message:* {message}
+💬 <b>Message:</b> {escape(str(message))}
 
-🕐 *Time:* {datetime.utcnow().strftime("%H:%M:%S UTC")}
+🕐 <b>Time:</b> {timestamp}
             """
             
-            # Send to subscribers
-            for chat_id in self.subscribers:
-                try:
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=risk_message,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send risk alert to {chat_id}: {str(e)}")
+            # Send to all subscribers in the background
+            await self._enqueue(risk_message, "risk alert", severity)
             
             logger.info(f"Risk alert sent: {alert_type} ({severity})")
             
@@ -410,35 +586,27 @@ To modify settings, contact the HTS team.
             price = trade_data.get("price", 0)
             pnl = trade_data.get("realized_pnl", 0)
             
-            side_emoji = {"BUY": "🟢", "SELL": "🔴"}
-            emoji = side_emoji.get(side, "📊")
+            emoji = _SIDE_EMOJI.get(side, "📊")
+            timestamp = _utc_clock()
             
             pnl_text = ""
             if pnl != 0:
                 pnl_emoji = "💰" if pnl > 0 else "💸"
-                pnl_text = f"\n{pnl_emoji} *P&L:* {'+' if pnl > 0 else ''}${pnl:,.2f}"
+                pnl_text = f"\n{pnl_emoji} <b>P&amp;L:</b> {'+' if pnl > 0 else ''}${pnl:,.2f}"
             
             trade_message = f"""
-{emoji} *TRADE EXECUTED*
+{emoji} <b>TRADE EXECUTED</b>
 
-🪙 *Symbol:* {symbol}
-📊 *Side:* {side}
-🔢 *Quantity:* {quantity:,.4f}
-💰 *Price:* ${price:,.2f}{pnl_text}
+🪙 <b>Symbol:</b> {escape(str(symbol))}
+📊 <b>Side:</b> {escape(str(side))}
+🔢 <b>Quantity:</b> {quantity:,.4f}
+💰 <b>Price:</b> ${price:,.2f}{pnl_text}
 
-🕐 *Time:* {datetime.utcnow().strftime("%H:%M:%S UTC")}
+🕐 <b>Time:</b> {timestamp}
             """
             
-            # Send to subscribers
-            for chat_id in self.subscribers:
-                try:
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=trade_message,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send trade confirmation to {chat_id}: {str(e)}")
+            # Send to all subscribers in the background
+            await self._enqueue(trade_message, "trade confirmation", "high")
             
             logger.info(f"Trade confirmation sent: {symbol} {side}")
             
@@ -451,6 +619,7 @@ To modify settings, contact the HTS team.
             if not self.bot or not self.subscribers or not self.alert_settings["api_status"]:
                 return
             
+            # Decide on the counts alone before rendering anything
             healthy_count = sum(1 for api in api_data.values() if api.get("status") == "healthy")
             total_count = len(api_data)
             uptime_pct = healthy_count / total_count * 100 if total_count > 0 else 0
@@ -460,46 +629,192 @@ To modify settings, contact the HTS team.
                 return
             
             status_emoji = "🟢" if uptime_pct > 75 else "🟡" if uptime_pct > 50 else "🔴"
+            timestamp = _utc_clock()
+            
+            # Details for problematic APIs, joined once
+            degraded = "\n".join(
+                f"• {escape(str(api_name))}: {escape(str(api_info.get('status', 'unknown')))}"
+                for api_name, api_info in api_data.items()
+                if api_info.get("status") != "healthy"
+            )
             
             api_message = f"""
-{status_emoji} *API STATUS ALERT*
+{status_emoji} <b>API STATUS ALERT</b>
+
+📊 <b>System Health:</b> {uptime_pct:.1f}%
+🟢 <b>Healthy APIs:</b> {healthy_count}/{total_count}
 
-📊 *System Health:* {uptime_pct:.1f}%
-🟢 *Healthy APIs:* {healthy_count}/{total_count}
+⚠️ <b>Degraded/Down APIs:</b>
+{degraded}
 
-⚠️ *Degraded/Down APIs:*
+🕐 <b>Time:</b> {timestamp}
             """
             
-            # Add details for problematic APIs
-            for api_name, api_info in api_data.items():
-                if api_info.get("status") != "healthy":
-                    status = api_info.get("status", "unknown")
-                    api_message += f"\n• {api_name}: {status}"
-            
-            api_message += f"\n\n🕐 *Time:* {datetime.utcnow().strftime('%H:%M:%S UTC')}"
-            
-            # Send to subscribers
-            for chat_id in self.subscribers:
-                try:
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=api_message,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send API status alert to {chat_id}: {str(e)}")
+            # Send to all subscribers in the background
+            await self._enqueue(api_message, "API status alert", "low", key="api_status")
             
             logger.info(f"API status alert sent: {uptime_pct:.1f}% health")
             
         except Exception as e:
             logger.error(f"Error sending API status alert: {str(e)}")
     
+    async def _enqueue(self, text: str, description: str, severity: str, key: Optional[str] = None):
+        """Hand an alert to the sender task so callers never wait on Telegram"""
+        priority = _PRIORITY.get(str(severity).lower(), _PRIORITY["medium"])
+        if self._sender_task is None:
+            await self._dispatch(text, description, priority, key)
+            return
+        
+        try:
+            self._send_queue.put_nowait((priority, next(self._send_seq), text, description, key))
+        except asyncio.QueueFull:
+            logger.warning(f"Telegram send queue full, dropping {description}")
+    
+    async def _sender_loop(self):
+        """Dispatch queued alerts in the background, most severe first"""
+        while True:
+            priority, _, text, description, key = await self._send_queue.get()
+            try:
+                await self._dispatch(text, description, priority, key)
+            except Exception as e:
+                logger.error(f"Error sending {description}: {str(e)}")
+            finally:
+                self._send_queue.task_done()
+    
+    def _new_outbox(self) -> Dict[str, Deque[Tuple[Optional[str], str]]]:
+        """Create an empty outbox whose per-chat buffers drop their oldest alerts when full"""
+        return defaultdict(lambda: deque(maxlen=self.max_buffer_size))
+    
+    async def _dispatch(self, text: str, description: str, priority: int, key: Optional[str] = None):
+        """
+        Queue an alert for the next batch flush, or send it now when batching is off
+        or the alert is critical.
+        
+        An alert with a key overwrites a pending alert with the same key among the
+        last COALESCE_WINDOW entries, so only the latest signal per symbol is sent.
+        """
+        if not self.batch_enabled or self._flush_task is None or priority == _PRIORITY["critical"]:
+            await self._broadcast(text, description)
+            return
+        
+        for chat_id in self._subscribers_tuple:
+            pending = self._outbox[chat_id]
+            if key is None or not _coalesce(pending, key, text):
+                pending.append((key, text))
+            if len(pending) == 1:
+                # Only an empty -> non-empty transition needs to wake the flusher
+                self._wakeup.set()
+    
+    async def _broadcast(self, text: str, description: str):
+        """Send an HTML message to every subscriber concurrently"""
+        await self._send_all([(chat_id, text) for chat_id in self._subscribers_tuple], description)
+    
+    async def _send_all(self, messages: List[Tuple[str, str]], description: str):
+        """Send (chat_id, text) HTML messages concurrently, logging failures in one record"""
+        results = await asyncio.gather(
+            *(self._send_message(chat_id, text) for chat_id, text in messages),
+            return_exceptions=True
+        )
+        
+        failures = [
+            f"{chat_id}: {str(result)}"
+            for (chat_id, _), result in zip(messages, results)
+            if isinstance(result, Exception)
+        ]
+        if failures:
+            # One record per broadcast, so an outage does not log once per subscriber
+            logger.error(
+                f"Failed to send {description} to {len(failures)}/{len(messages)} chats: "
+                + "; ".join(failures)
+            )
+    
+    async def _send_message(self, chat_id: str, text: str):
+        """Send one HTML message within the global and per-chat rate limits"""
+        chat_bucket = self._chat_buckets.get(chat_id)
+        if chat_bucket is None:
+            chat_bucket = self._chat_buckets[chat_id] = _TokenBucket(CHAT_RATE_LIMIT)
+        
+        # Wait on the chat first so a slow chat does not hold up global tokens
+        await chat_bucket.acquire()
+        await self._global_bucket.acquire()
+        
+        try:
+            await self.bot.send_message(chat_id=chat_id, text=text, parse_mode=ParseMode.HTML)
+        except RetryAfter as e:
+            # Flood control applies to the whole bot: hold every send back
+            logger.warning(f"Telegram flood control for {chat_id}, retrying in {e.retry_after}s")
+            self._global_bucket.pause(e.retry_after)
+            if self._flush_task is not None:
+                # Requeue ahead of newer alerts for the next flush, unless the
+                # buffer is already full of newer ones
+                pending = self._outbox[chat_id]
+                if len(pending) < pending.maxlen:
+                    pending.appendleft((None, text))
+                    self._wakeup.set()
+                else:
+                    logger.warning(f"Telegram outbox full for {chat_id}, dropping rate-limited batch")
+            else:
+                await asyncio.sleep(e.retry_after)
+                await self.bot.send_message(chat_id=chat_id, text=text, parse_mode=ParseMode.HTML)
+    
+    async def _flush_outbox(self):
+        """Send each chat's pending alerts joined into as few messages as possible"""
+        outbox, self._outbox = self._outbox, self._new_outbox()
+        messages = [
+            (chat_id, chunk)
+            for chat_id, pending in outbox.items()
+            if pending
+            for chunk in _pack_messages([text.strip() for _, text in pending])
+        ]
+        if messages:
+            await self._send_all(messages, "batched alerts")
+    
+    async def _flush_loop(self):
+        """Flush the outbox batch_flush_interval seconds after the first pending alert, until stop_bot"""
+        stopping = self._flush_stop
+        while not stopping.is_set():
+            await self._wakeup.wait()
+            # Wait out the batching interval, cut short by stop_bot, which then
+            # sends whatever is pending itself
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=self.batch_flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if stopping.is_set():
+                break
+            # Clear before the outbox is swapped out so a later alert re-arms the wakeup
+            self._wakeup.clear()
+            try:
+                await self._flush_outbox()
+            except Exception as e:
+                logger.error(f"Error flushing Telegram alerts: {str(e)}")
+    
     async def start_bot(self):
         """Start the Telegram bot"""
         try:
             if self.application:
                 await self.application.initialize()
                 await self.application.start()
+                if self.webhook_url:
+                    await self.bot.set_webhook(
+                        url=self.webhook_url,
+                        allowed_updates=[Update.MESSAGE],
+                        drop_pending_updates=False,
+                        secret_token=self.webhook_secret
+                    )
+                else:
+                    # Poll back to back; the server-side timeout does the waiting
+                    await self.application.updater.start_polling(
+                        poll_interval=0.0,
+                        timeout=POLL_TIMEOUT,
+                        allowed_updates=[Update.MESSAGE],
+                        drop_pending_updates=False
+                    )
+                if self.batch_enabled and self._flush_task is None:
+                    self._flush_stop.clear()
+                    self._flush_task = asyncio.create_task(self._flush_loop())
+                if self._sender_task is None:
+                    self._sender_task = asyncio.create_task(self._sender_loop())
                 logger.info("Telegram bot started")
             
         except Exception as e:
@@ -508,23 +823,71 @@ To modify settings, contact the HTS team.
     async def stop_bot(self):
         """Stop the Telegram bot"""
         try:
+            if self._sender_task:
+                # Let the sender hand over queued alerts, but a backlog behind the
+                # per-chat rate limit must not hold up shutdown indefinitely
+                try:
+                    await asyncio.wait_for(self._send_queue.join(), timeout=SHUTDOWN_DRAIN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        f"Telegram send queue not drained after {SHUTDOWN_DRAIN_TIMEOUT}s, "
+                        f"dropping {self._send_queue.qsize()} queued alerts"
+                    )
+                self._sender_task.cancel()
+                self._sender_task = None
+            
+            if self._flush_task:
+                # Never cancel mid-flush: the batch being sent is already out of
+                # the outbox. Let the flusher finish its current flush and exit.
+                self._flush_stop.set()
+                self._wakeup.set()
+                await self._flush_task
+                self._flush_task = None
+                # With no flusher, rate-limited sends now wait and retry in place
+                # instead of being requeued; loop in case the last flush requeued any
+                while any(self._outbox.values()):
+                    await self._flush_outbox()
+            
             if self.application:
+                if self.webhook_url:
+                    await self.bot.delete_webhook()
+                elif self.application.updater.running:
+                    await self.application.updater.stop()
                 await self.application.stop()
                 logger.info("Telegram bot stopped")
             
         except Exception as e:
             logger.error(f"Error stopping Telegram bot: {str(e)}")
     
+    def verify_webhook_secret(self, secret_token: Optional[str]) -> bool:
+        """Check that a webhook request carries this bot's secret token; check before reading the body"""
+        if not self.application or not self.webhook_url:
+            return False
+        if secret_token is None or not secrets.compare_digest(secret_token, self.webhook_secret):
+            logger.warning("Rejected Telegram webhook update with a bad secret token")
+            return False
+        return True
+    
+    async def process_webhook_update(self, data: Dict[str, Any], secret_token: Optional[str]) -> bool:
+        """Queue an update pushed by Telegram to the webhook; False if it is not from Telegram"""
+        if not self.verify_webhook_secret(secret_token):
+            return False
+        
+        await self.application.update_queue.put(Update.de_json(data, self.bot))
+        return True
+    
     def add_subscriber(self, chat_id: str):
         """Add a subscriber manually"""
         if chat_id not in self.subscribers:
-            self.subscribers.append(chat_id)
+            self.subscribers.add(chat_id)
+            self._subscribers_tuple = tuple(self.subscribers)
             logger.info(f"Added subscriber: {chat_id}")
     
     def remove_subscriber(self, chat_id: str):
         """Remove a subscriber manually"""
         if chat_id in self.subscribers:
-            self.subscribers.remove(chat_id)
+            self.subscribers.discard(chat_id)
+            self._subscribers_tuple = tuple(self.subscribers)
             logger.info(f"Removed subscriber: {chat_id}")
     
     def get_subscriber_count(self) -> int:
@@ -534,4 +897,5 @@ To modify settings, contact the HTS team.
     def update_alert_settings(self, settings: Dict[str, bool]):
         """Update alert settings"""
         self.alert_settings.update(settings)
+        self._alerts_rendered = None
         logger.info(f"Alert settings updated: {settings}")
\ No newline at end of file
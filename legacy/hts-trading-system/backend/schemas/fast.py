@@ -0,0 +1,108 @@
+"""
+HTS Trading System - Fast Ingestion Schemas
+msgspec structs for the highest-frequency inbound messages.
+
+These mirror PriceData, TradingSignal and APIHealthStatus from
+schemas.validation but decode straight from JSON bytes (or convert from
+dicts) in C. The Pydantic models remain the REST/OpenAPI schemas.
+"""
+
+from typing import Annotated, Any, Dict, Optional, Union
+from datetime import datetime
+
+import msgspec
+from msgspec.structs import force_setattr
+
+from .validation import SignalType, APIStatus
+
+Symbol = str  # Length-checked after stripping and uppercasing, see _normalize_symbol_length
+Score = Annotated[float, msgspec.Meta(ge=0, le=100)]
+Positive = Annotated[float, msgspec.Meta(gt=0)]
+NonNegative = Annotated[float, msgspec.Meta(ge=0)]
+Count = Annotated[int, msgspec.Meta(ge=0)]
+
+def _normalize_symbol_length(symbol: str) -> str:
+    """Strip and uppercase a symbol, then apply the 3-20 length check of validation.Symbol"""
+    normalized = symbol.strip().upper()
+    if not 3 <= len(normalized) <= 20:
+        raise ValueError("Symbol must be between 3 and 20 characters")
+    return normalized
+
+# gc=False: instances hold no reference cycles, so skip GC tracking for
+# the many short-lived messages
+class PriceDataFast(msgspec.Struct, frozen=True, gc=False):
+    """Price data message"""
+    symbol: Symbol
+    price: Positive
+    change_24h: Optional[float] = None
+    volume: Optional[NonNegative] = None
+    high_24h: Optional[Positive] = None
+    low_24h: Optional[Positive] = None
+    timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
+
+    def __post_init__(self):
+        force_setattr(self, "symbol", _normalize_symbol_length(self.symbol))
+
+class SignalComponentsFast(msgspec.Struct, frozen=True, gc=False):
+    """Signal component scores (0-100)"""
+    rsi_macd: Score
+    smc: Score
+    pattern: Score
+    sentiment: Score
+    ml: Score
+
+class TradingSignalFast(msgspec.Struct, frozen=True, gc=False):
+    """Trading signal message"""
+    symbol: Symbol
+    signal: SignalType
+    confidence: Score
+    price: Positive
+    rsi: Optional[Score] = None
+    macd: Optional[float] = None
+    volume_ratio: Optional[Positive] = None
+    components: Optional[SignalComponentsFast] = None
+    timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
+
+    def __post_init__(self):
+        force_setattr(self, "symbol", _normalize_symbol_length(self.symbol))
+        force_setattr(self, "confidence", round(self.confidence, 2))
+
+class APIHealthStatusFast(msgspec.Struct, frozen=True, gc=False):
+    """API health status message"""
+    name: Annotated[str, msgspec.Meta(min_length=1)]
+    status: APIStatus
+    response_time: NonNegative
+    last_check: datetime
+    error_count: Count
+    success_count: Count
+    consecutive_failures: Count
+    success_rate: Score
+
+# Decoders are built once and reused for every message
+_PRICE_DECODER = msgspec.json.Decoder(PriceDataFast)
+_SIGNAL_DECODER = msgspec.json.Decoder(TradingSignalFast)
+_HEALTH_DECODER = msgspec.json.Decoder(APIHealthStatusFast)
+
+def decode_price_data(raw: Union[bytes, str]) -> PriceDataFast:
+    """Decode and validate a JSON price message in one pass"""
+    return _PRICE_DECODER.decode(raw)
+
+def decode_signal(raw: Union[bytes, str]) -> TradingSignalFast:
+    """Decode and validate a JSON trading signal in one pass"""
+    return _SIGNAL_DECODER.decode(raw)
+
+def decode_api_health(raw: Union[bytes, str]) -> APIHealthStatusFast:
+    """Decode and validate a JSON API health message in one pass"""
+    return _HEALTH_DECODER.decode(raw)
+
+def convert_price_data(data: Dict[str, Any]) -> PriceDataFast:
+    """Validate an already parsed price dict"""
+    return msgspec.convert(data, PriceDataFast)
+
+def convert_signal(data: Dict[str, Any]) -> TradingSignalFast:
+    """Validate an already parsed trading signal dict"""
+    return msgspec.convert(data, TradingSignalFast)
+
+def convert_api_health(data: Dict[str, Any]) -> APIHealthStatusFast:
+    """Validate an already parsed API health dict"""
+    return msgspec.convert(data, APIHealthStatusFast)
@@ -3,12 +3,36 @@ HTS Trading System - Data Validation Schemas
 Pydantic models for data validation and serialization.
 """
 
-from typing import Dict, List, Optional, Any, Union
+import re
+import sys
+from functools import lru_cache
+from typing import Annotated, Dict, List, Optional, Any, Union
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
-from pydantic import BaseModel, Field, validator, root_validator
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, computed_field, field_validator
+
+# Normalized symbols: uppercase alphanumerics, hyphens and forward slashes
+_SYMBOL_CHARS_RE = re.compile(r'[A-Z0-9/-]+')
+# Raw symbols: 3-20 of those characters in any case, at least one alphanumeric
+_SYMBOL_RE = re.compile(r'(?=.*[A-Z0-9])[A-Z0-9/-]{3,20}', re.ASCII | re.IGNORECASE)
+
+# Final score weights for (rsi_macd, smc, pattern, sentiment, ml)
+_SCORE_WEIGHTS = np.array([0.40, 0.25, 0.20, 0.10, 0.05])
+
+# Quantum for position amounts (8 decimal places, i.e. satoshi precision)
+_POSITION_QUANTUM = Decimal('0.00000001')
+
+# Quanta for validate_decimal_precision, by number of decimal places
+_DECIMAL_QUANTA = {places: Decimal(1).scaleb(-places) for places in range(19)}
+
+# datetime.fromisoformat parses a trailing 'Z' itself from Python 3.11
+_ISO_PARSES_Z = sys.version_info >= (3, 11)
+
+# Trading symbol, stripped and uppercased by pydantic-core before the length check
+Symbol = Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True, min_length=3, max_length=20)]
 
 class SignalType(str, Enum):
     """Trading signal types"""
@@ -32,6 +56,8 @@ class APIStatus(str, Enum):
 
 class SignalComponents(BaseModel):
     """Signal component scores"""
+    model_config = ConfigDict(frozen=True)
+    
     rsi_macd: float = Field(..., ge=0, le=100, description="RSI/MACD score (0-100)")
     smc: float = Field(..., ge=0, le=100, description="Smart Money Concepts score (0-100)")
     pattern: float = Field(..., ge=0, le=100, description="Pattern recognition score (0-100)")
@@ -40,7 +66,7 @@ class SignalComponents(BaseModel):
 
 class TradingSignal(BaseModel):
     """Trading signal data model"""
-    symbol: str = Field(..., min_length=3, max_length=20, description="Trading symbol")
+    symbol: Symbol = Field(..., description="Trading symbol")
     signal: SignalType = Field(..., description="Signal type")
     confidence: float = Field(..., ge=0, le=100, description="Signal confidence (0-100)")
     price: float = Field(..., gt=0, description="Current price")
@@ -50,11 +76,8 @@ class TradingSignal(BaseModel):
     components: Optional[SignalComponents] = Field(None, description="Signal components")
     timestamp: datetime = Field(default_factory=datetime.utcnow, description="Signal timestamp")
     
-    @validator('symbol')
-    def validate_symbol(cls, v):
-        return v.upper().strip()
-    
-    @validator('confidence')
+    @field_validator('confidence')
+    @classmethod
     def validate_confidence(cls, v):
         return round(v, 2)
 
@@ -64,14 +87,17 @@ class SignalValidator:
     @staticmethod
     def validate_signal_data(data: Dict[str, Any]) -> TradingSignal:
         """Validate and parse signal data"""
-        return TradingSignal(**data)
+        return TradingSignal.model_validate(data)
+    
+    @staticmethod
+    def validate_signal_json(raw: Union[bytes, str]) -> TradingSignal:
+        """Validate and parse a JSON signal message without a json.loads pass"""
+        return TradingSignal.model_validate_json(raw)
     
     @staticmethod
     def is_valid_symbol(symbol: str) -> bool:
         """Check if symbol is valid format"""
-        if not symbol or len(symbol) < 3 or len(symbol) > 20:
-            return False
-        return symbol.replace("-", "").replace("/", "").isalnum()
+        return bool(symbol) and _SYMBOL_RE.fullmatch(symbol) is not None
     
     @staticmethod
     def calculate_final_score(components: SignalComponents) -> float:
@@ -83,25 +109,33 @@ class SignalValidator:
             0.10 * components.sentiment +
             0.05 * components.ml
         )
+    
+    @staticmethod
+    def calculate_final_scores(components: np.ndarray) -> np.ndarray:
+        """
+        Calculate final scores for a batch of signals.
+        
+        `components` is an (n, 5) float64 array with columns rsi_macd, smc,
+        pattern, sentiment and ml; returns the n weighted scores.
+        """
+        return np.asarray(components, dtype=np.float64) @ _SCORE_WEIGHTS
 
 class PriceData(BaseModel):
     """Price data model"""
-    symbol: str = Field(..., min_length=3, max_length=20)
+    model_config = ConfigDict(frozen=True)
+    
+    symbol: Symbol
     price: float = Field(..., gt=0)
     change_24h: Optional[float] = Field(None, description="24h price change %")
     volume: Optional[float] = Field(None, ge=0, description="24h volume")
     high_24h: Optional[float] = Field(None, gt=0, description="24h high")
     low_24h: Optional[float] = Field(None, gt=0, description="24h low")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
-    
-    @validator('symbol')
-    def validate_symbol(cls, v):
-        return v.upper().strip()
 
 class Position(BaseModel):
     """Portfolio position model"""
     id: Optional[int] = Field(None, description="Position ID")
-    symbol: str = Field(..., min_length=3, max_length=20)
+    symbol: Symbol
     quantity: Decimal = Field(..., description="Position quantity")
     avg_price: Decimal = Field(..., gt=0, description="Average entry price")
     current_price: Decimal = Field(..., gt=0, description="Current market price")
@@ -116,38 +150,27 @@ class Position(BaseModel):
     stop_loss: Optional[Decimal] = Field(None, gt=0, description="Stop loss price")
     take_profit: Optional[Decimal] = Field(None, gt=0, description="Take profit price")
     
-    @validator('symbol')
-    def validate_symbol(cls, v):
-        return v.upper().strip()
-    
-    @validator('quantity', 'avg_price', 'current_price', 'market_value', 
-              'unrealized_pnl', 'realized_pnl', 'total_pnl')
+    @field_validator('quantity', 'avg_price', 'current_price', 'market_value',
+                     'unrealized_pnl', 'realized_pnl', 'total_pnl')
+    @classmethod
     def round_decimals(cls, v):
-        return v.quantize(Decimal('0.00000001'))
+        return v.quantize(_POSITION_QUANTUM)
 
 class Trade(BaseModel):
     """Trade execution model"""
     id: Optional[int] = Field(None, description="Trade ID")
-    symbol: str = Field(..., min_length=3, max_length=20)
+    symbol: Symbol
     side: TradeSide = Field(..., description="Trade side (BUY/SELL)")
     quantity: Decimal = Field(..., gt=0, description="Trade quantity")
     price: Decimal = Field(..., gt=0, description="Execution price")
-    trade_value: Decimal = Field(..., gt=0, description="Total trade value")
     pnl: Decimal = Field(default=Decimal('0'), description="Realized P&L")
     fees: Decimal = Field(default=Decimal('0'), ge=0, description="Trading fees")
     executed_at: datetime = Field(default_factory=datetime.utcnow, description="Execution time")
     
-    @validator('symbol')
-    def validate_symbol(cls, v):
-        return v.upper().strip()
-    
-    @root_validator
-    def validate_trade_value(cls, values):
-        quantity = values.get('quantity')
-        price = values.get('price')
-        if quantity and price:
-            values['trade_value'] = quantity * price
-        return values
+    @computed_field(description="Total trade value")
+    @property
+    def trade_value(self) -> Decimal:
+        return self.quantity * self.price
 
 class PortfolioSummary(BaseModel):
     """Portfolio summary model"""
@@ -170,6 +193,8 @@ class PortfolioSummary(BaseModel):
 
 class APIHealthStatus(BaseModel):
     """API health status model"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str = Field(..., min_length=1, description="API service name")
     status: APIStatus = Field(..., description="Current status")
     response_time: float = Field(..., ge=0, description="Response time in ms")
@@ -181,15 +206,11 @@ class APIHealthStatus(BaseModel):
 
 class BacktestRequest(BaseModel):
     """Backtest request model"""
-    symbol: str = Field(..., min_length=3, max_length=20)
+    symbol: Symbol
     days: int = Field(default=30, ge=1, le=365, description="Backtest period in days")
     initial_capital: float = Field(default=10000.0, gt=0, description="Starting capital")
     risk_per_trade: float = Field(default=0.02, gt=0, le=0.1, description="Risk per trade (0-10%)")
     commission: float = Field(default=0.001, ge=0, le=0.01, description="Commission rate")
-    
-    @validator('symbol')
-    def validate_symbol(cls, v):
-        return v.upper().strip()
 
 class BacktestResult(BaseModel):
     """Backtest result model"""
@@ -216,6 +237,8 @@ class BacktestResult(BaseModel):
 
 class RiskMetrics(BaseModel):
     """Risk metrics model"""
+    model_config = ConfigDict(frozen=True)
+    
     var_1d: float = Field(..., ge=0, description="1-day Value at Risk")
     var_7d: float = Field(..., ge=0, description="7-day Value at Risk")
     expected_shortfall: float = Field(..., ge=0, description="Expected Shortfall")
@@ -228,6 +251,8 @@ class RiskMetrics(BaseModel):
 
 class NotificationSettings(BaseModel):
     """Notification settings model"""
+    model_config = ConfigDict(frozen=True)
+    
     strong_signals: bool = Field(default=True, description="Strong signal alerts")
     portfolio_updates: bool = Field(default=True, description="Portfolio update alerts")
     risk_alerts: bool = Field(default=True, description="Risk alerts")
@@ -236,6 +261,8 @@ class NotificationSettings(BaseModel):
 
 class TelegramAlert(BaseModel):
     """Telegram alert model"""
+    model_config = ConfigDict(frozen=True)
+    
     type: str = Field(..., description="Alert type")
     message: str = Field(..., min_length=1, description="Alert message")
     severity: str = Field(default="medium", description="Alert severity")
@@ -248,26 +275,52 @@ class PortfolioValidator:
     @staticmethod
     def validate_position_data(data: Dict[str, Any]) -> Position:
         """Validate and parse position data"""
-        return Position(**data)
+        return Position.model_validate(data)
     
     @staticmethod
     def validate_trade_data(data: Dict[str, Any]) -> Trade:
         """Validate and parse trade data"""
-        return Trade(**data)
+        return Trade.model_validate(data)
     
     @staticmethod
     def validate_portfolio_summary(data: Dict[str, Any]) -> PortfolioSummary:
         """Validate and parse portfolio summary data"""
-        return PortfolioSummary(**data)
+        return PortfolioSummary.model_validate(data)
     
     @staticmethod
     def calculate_position_metrics(position: Position) -> Dict[str, float]:
         """Calculate additional position metrics"""
+        avg_price = float(position.avg_price)
+        # Both P&L percentages share the cost basis; divide once
+        inv_cost = 100.0 / (avg_price * float(position.quantity))
         return {
-            "unrealized_pnl_pct": float(position.unrealized_pnl / (position.avg_price * position.quantity) * 100),
-            "total_pnl_pct": float(position.total_pnl / (position.avg_price * position.quantity) * 100),
-            "price_change_pct": float((position.current_price - position.avg_price) / position.avg_price * 100)
+            "unrealized_pnl_pct": float(position.unrealized_pnl) * inv_cost,
+            "total_pnl_pct": float(position.total_pnl) * inv_cost,
+            "price_change_pct": (float(position.current_price) - avg_price) / avg_price * 100
         }
+    
+    @staticmethod
+    def calculate_metrics_batch(positions: List[Position]) -> Dict[str, np.ndarray]:
+        """
+        Calculate position metrics for many positions at once.
+        
+        Returns one float64 array per metric, aligned with `positions`;
+        a position with a zero cost basis yields inf or nan.
+        """
+        n = len(positions)
+        avg_price = np.fromiter((float(p.avg_price) for p in positions), dtype=np.float64, count=n)
+        quantity = np.fromiter((float(p.quantity) for p in positions), dtype=np.float64, count=n)
+        current_price = np.fromiter((float(p.current_price) for p in positions), dtype=np.float64, count=n)
+        unrealized_pnl = np.fromiter((float(p.unrealized_pnl) for p in positions), dtype=np.float64, count=n)
+        total_pnl = np.fromiter((float(p.total_pnl) for p in positions), dtype=np.float64, count=n)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_cost = 100.0 / (avg_price * quantity)
+            return {
+                "unrealized_pnl_pct": unrealized_pnl * inv_cost,
+                "total_pnl_pct": total_pnl * inv_cost,
+                "price_change_pct": (current_price - avg_price) / avg_price * 100
+            }
 
 class SystemStatus(BaseModel):
     """System status model"""
@@ -280,6 +333,8 @@ class SystemStatus(BaseModel):
 
 class ErrorResponse(BaseModel):
     """Error response model"""
+    model_config = ConfigDict(frozen=True)
+    
     error: str = Field(..., description="Error message")
     code: Optional[str] = Field(None, description="Error code")
     details: Optional[Dict[str, Any]] = Field(None, description="Additional error details")
@@ -287,6 +342,8 @@ class ErrorResponse(BaseModel):
 
 class SuccessResponse(BaseModel):
     """Success response model"""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool = Field(default=True, description="Success flag")
     message: Optional[str] = Field(None, description="Success message")
     data: Optional[Any] = Field(None, description="Response data")
@@ -295,12 +352,15 @@ class SuccessResponse(BaseModel):
 # Utility functions for validation
 def validate_decimal_precision(value: Union[str, int, float, Decimal], precision: int = 8) -> Decimal:
     """Validate and format decimal with specified precision"""
-    decimal_value = Decimal(str(value))
-    return decimal_value.quantize(Decimal('0.' + '0' * precision))
+    decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
+    quantum = _DECIMAL_QUANTA.get(precision)
+    if quantum is None:
+        quantum = Decimal('0.' + '0' * precision)
+    return decimal_value.quantize(quantum)
 
 def validate_percentage(value: float, min_val: float = 0.0, max_val: float = 100.0) -> float:
     """Validate percentage value within range"""
-    if value < min_val or value > max_val:
+    if not min_val <= value <= max_val:  # also rejects NaN
         raise ValueError(f"Percentage must be between {min_val} and {max_val}")
     return round(value, 2)
 
@@ -309,14 +369,18 @@ def validate_symbol_format(symbol: str) -> str:
     if not symbol or not isinstance(symbol, str):
         raise ValueError("Symbol must be a non-empty string")
     
+    return _normalize_symbol(symbol)
+
+@lru_cache(maxsize=4096)
+def _normalize_symbol(symbol: str) -> str:
+    """Normalize and check a symbol string; cached since the same symbols recur"""
     normalized = symbol.upper().strip()
     
     if len(normalized) < 3 or len(normalized) > 20:
         raise ValueError("Symbol must be between 3 and 20 characters")
     
     # Allow alphanumeric characters, hyphens, and forward slashes
-    allowed_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-/')
-    if not set(normalized).issubset(allowed_chars):
+    if _SYMBOL_CHARS_RE.fullmatch(normalized) is None:
         raise ValueError("Symbol contains invalid characters")
     
     return normalized
@@ -325,10 +389,17 @@ def validate_timestamp(timestamp: Union[str, datetime]) -> datetime:
     """Validate and parse timestamp"""
     if isinstance(timestamp, str):
         try:
-            return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            return _parse_timestamp(timestamp)
         except ValueError:
             raise ValueError("Invalid timestamp format")
     elif isinstance(timestamp, datetime):
         return timestamp
     else:
-        raise ValueError("Timestamp must be string or datetime object")
\ No newline at end of file
+        raise ValueError("Timestamp must be string or datetime object")
+
+@lru_cache(maxsize=1024)
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO timestamp; cached since bar timestamps repeat across symbols"""
+    if not _ISO_PARSES_Z and timestamp.endswith('Z'):
+        timestamp = timestamp[:-1] + '+00:00'
+    return datetime.fromisoformat(timestamp)
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Tests for the cached API request helper in data.api_config.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from data import api_config
+from data.api_config import API_CLIENTS, API_CONFIG, cached_get, close_clients, headers_for, params_for
+
+@pytest.fixture
+def requested_urls():
+    """Route the pooled clients through a transport that records request URLs"""
+    urls = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        urls.append(request.url.copy_with(query=None))
+        return httpx.Response(200, json={"ok": True})
+    
+    for name, config in API_CONFIG.items():
+        API_CLIENTS[name] = httpx.AsyncClient(
+            base_url=config["base_url"],
+            headers=headers_for(name),
+            params=params_for(name),
+            transport=httpx.MockTransport(handler)
+        )
+    api_config._RESPONSE_CACHE.clear()
+    yield urls
+    api_config._RESPONSE_CACHE.clear()
+    asyncio.run(close_clients())
+
+def test_cached_get_empty_endpoint_keeps_configured_url(requested_urls):
+    assert API_CONFIG["etherscan"]["endpoints"]["balance"] == ""
+    asyncio.run(cached_get("etherscan", "balance", params={"module": "account"}))
+    assert [str(url) for url in requested_urls] == ["https://api.etherscan.io/api"]
+
+def test_cached_get_formats_templated_endpoint(requested_urls):
+    asyncio.run(cached_get("coinbase", "price", symbol="BTC-USD"))
+    assert [str(url) for url in requested_urls] == [
+        "https://api.exchange.coinbase.com/products/BTC-USD/ticker"
+    ]
+
+def test_cached_get_serves_fresh_responses_from_cache(requested_urls):
+    async def fetch_twice():
+        first = await cached_get("binance", "price", params={"symbol": "BTCUSDT"})
+        second = await cached_get("binance", "price", params={"symbol": "BTCUSDT"})
+        return first, second
+    
+    assert asyncio.run(fetch_twice()) == ({"ok": True}, {"ok": True})
+    assert len(requested_urls) == 1
@@ -0,0 +1,59 @@
+"""
+Tests that the msgspec fast schemas accept and reject the same input as
+the Pydantic models they mirror.
+"""
+import json
+
+import msgspec
+import pytest
+from pydantic import ValidationError
+
+from schemas.fast import decode_price_data, decode_signal, convert_price_data
+from schemas.validation import PriceData, TradingSignal
+
+SYMBOLS = [
+    "BTCUSDT",
+    "btc/usdt",
+    "  eth-usd  ",
+    "ABC",
+    "A" * 20,
+    "  " + "a" * 20 + "  ",
+    "",
+    "   ",
+    " ab ",
+    "AB",
+    "A" * 21,
+]
+
+def _pydantic_symbol(model, data):
+    try:
+        return model.model_validate(data).symbol
+    except ValidationError:
+        return None
+
+def _fast_symbol(decode, data):
+    try:
+        return decode(json.dumps(data).encode()).symbol
+    except msgspec.ValidationError:
+        return None
+
+@pytest.mark.parametrize("symbol", SYMBOLS)
+def test_price_symbol_matches_pydantic(symbol):
+    data = {"symbol": symbol, "price": 1.0}
+    expected = _pydantic_symbol(PriceData, data)
+    assert _fast_symbol(decode_price_data, data) == expected
+
+    try:
+        converted = convert_price_data(data).symbol
+    except msgspec.ValidationError:
+        converted = None
+    assert converted == expected
+
+@pytest.mark.parametrize("symbol", SYMBOLS)
+def test_signal_symbol_matches_pydantic(symbol):
+    data = {"symbol": symbol, "signal": "BUY", "confidence": 75.0, "price": 1.0}
+    assert _fast_symbol(decode_signal, data) == _pydantic_symbol(TradingSignal, data)
+
+def test_blank_symbol_rejected():
+    with pytest.raises(msgspec.ValidationError):
+        decode_price_data(b'{"symbol":"   ","price":1}')
@@ -27,7 +27,9 @@ import {
   BacktestResult,
   formatPrice,
   formatPercentage,
-  formatDuration
+  formatDuration,
+  formatRatio,
+  equityCurveRows
 } from '../services/api';
 
 // Types
@@ -417,7 +419,7 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ result, onExport }) =
         <h3 className="text-lg font-semibold mb-4">Equity Curve</h3>
         <div className="h-64">
           <ResponsiveContainer width="100%" height="100%">
-            <AreaChart data={result.equity_curve}>
+            <AreaChart data={equityCurveRows(result.equity_curve)}>
               <CartesianGrid strokeDasharray="3 3" stroke="#374151" />
               <XAxis 
                 dataKey="timestamp" 
@@ -484,11 +486,11 @@ const BacktestResults: React.FC<BacktestResultsProps> = ({ result, onExport }) =
             />
             <MetricRow 
               label="Sortino Ratio" 
-              value={result.sortino_ratio.toFixed(2)} 
+              value={formatRatio(result.sortino_ratio)} 
             />
             <MetricRow 
               label="Profit Factor" 
-              value={result.profit_factor.toFixed(2)} 
+              value={formatRatio(result.profit_factor)} 
             />
           </div>
         </div>
@@ -97,9 +97,9 @@ export interface BacktestResult {
   total_return_pct: number;
   max_drawdown: number;
   sharpe_ratio: number;
-  sortino_ratio: number;
+  sortino_ratio: number | null;  // null when infinite
   win_rate: number;
-  profit_factor: number;
+  profit_factor: number | null;  // null when infinite
   total_trades: number;
   winning_trades: number;
   losing_trades: number;
@@ -108,8 +108,36 @@ export interface BacktestResult {
   largest_win: number;
   largest_loss: number;
   avg_trade_duration: number;
-  trades: any[];
-  equity_curve: any[];
+  trades: TradeColumns;
+  equity_curve?: EquityCurveColumns;  // absent when written to equity_curve_path
+  equity_curve_path?: string;
+}
+
+// Backtest trades and equity curve arrive column-wise, times in epoch nanoseconds
+export interface TradeColumns {
+  symbol: string;
+  side: 'BUY' | 'SELL';
+  entry_ns: number[];
+  exit_ns: number[];
+  quantity: number[];
+  entry_price: number[];
+  exit_price: number[];
+  pnl: number[];
+  pnl_pct: number[];
+  duration_hours: number[];
+  signal_confidence: number[];
+}
+
+export interface EquityCurveColumns {
+  timestamp_ns: number[];
+  capital: number[];
+  price: number[];
+}
+
+export interface EquityPoint {
+  timestamp: number;  // epoch milliseconds
+  capital: number;
+  price: number;
 }
 
 export interface Trade {
@@ -428,5 +456,21 @@ export const formatDuration = (hours: number): string => {
   }
 };
 
+export const formatRatio = (value: number | null, decimals: number = 2): string => {
+  return value === null ? '\u221e' : value.toFixed(decimals);
+};
+
+// Zip the columnar equity curve into chart rows
+export const equityCurveRows = (curve?: EquityCurveColumns): EquityPoint[] => {
+  if (!curve) {
+    return [];
+  }
+  return curve.timestamp_ns.map((timestampNs, i) => ({
+    timestamp: timestampNs / 1e6,
+    capital: curve.capital[i],
+    price: curve.price[i]
+  }));
+};
+
 // Export default
 export default apiClient;
\ No newline at end of file
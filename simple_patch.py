@@ -10,6 +10,8 @@ def patch_main_py():
     with open('/workspace/backend/main.py', 'r', encoding='utf-8') as f:
         lines = f.readlines()
     
+    changed = False
+    
     # Find and replace specific lines
     for i, line in enumerate(lines):
         # Fix portfolio summary endpoint
@@ -31,8 +33,13 @@ def patch_main_py():
             for j in range(i+1, i+13):
                 if j < len(lines):
                     lines[j] = ''
+            changed = True
             break
     
+    if not changed:
+        print("main.py already patched, nothing to do")
+        return
+    
     # Write back
     with open('/workspace/backend/main.py', 'w', encoding='utf-8') as f:
         f.writelines(lines)